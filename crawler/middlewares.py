@@ -3,7 +3,11 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+from logging import DEBUG
+from urllib.parse import urlparse
+
 from scrapy import signals
+from scrapy.exceptions import IgnoreRequest
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -12,6 +16,30 @@ logger = get_logger(__name__)
 from itemadapter import is_item, ItemAdapter
 
 
+class MediaBlockerDownloaderMiddleware:
+    """
+    Drops requests for media and static assets before they hit the downloader.
+    The spiders only ever need HTML pages (image URLs are extracted as plain
+    strings, never fetched), so anything ending in an image/CSS/font suffix
+    is a mistake — typically a relative link that slipped through extraction.
+    """
+
+    # Lowercase URL-path suffixes that never contain event data
+    BLOCKED_EXTENSIONS = (
+        '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico',
+        '.css', '.js',
+        '.woff', '.woff2', '.ttf', '.eot', '.otf',
+        '.mp3', '.mp4', '.avi', '.pdf', '.zip',
+    )
+
+    def process_request(self, request, spider):
+        path = urlparse(request.url).path.lower()
+        if path.endswith(self.BLOCKED_EXTENSIONS):
+            logger.debug("Blocking media/static asset request: %s", request.url)
+            raise IgnoreRequest(f"Blocked media/static asset: {request.url}")
+        return None
+
+
 class TouristEventsSpiderMiddleware:
     # Not all methods need to be defined. If a method is not defined,
     # scrapy acts as if the spider middleware does not modify the
@@ -29,7 +57,10 @@ class TouristEventsSpiderMiddleware:
         # middleware and into the spider.
 
         # Should return None or raise an exception.
-        logger.debug(f"Processing spider input for: {response.url}")
+        # isEnabledFor guard: at INFO level this hook costs no LogRecord
+        # or f-string formatting on the per-response path.
+        if logger.isEnabledFor(DEBUG):
+            logger.debug("Processing spider input for: %s", response.url)
         return None
 
     def process_spider_output(self, response, result, spider):
@@ -37,7 +68,8 @@ class TouristEventsSpiderMiddleware:
         # it has processed the response.
 
         # Must return an iterable of Request, or item objects.
-        logger.debug(f"Processing spider output for: {response.url}")
+        if logger.isEnabledFor(DEBUG):
+            logger.debug("Processing spider output for: %s", response.url)
         for i in result:
             yield i
 
@@ -46,7 +78,7 @@ class TouristEventsSpiderMiddleware:
         # (from other spider middleware) raises an exception.
 
         # Should return either None or an iterable of Request or item objects.
-        logger.error(f"Spider exception processing {response.url}: {exception}", exc_info=True)
+        logger.error("Spider exception processing %s: %s", response.url, exception, exc_info=True)
         pass
 
     def process_start_requests(self, start_requests, spider):
@@ -55,12 +87,13 @@ class TouristEventsSpiderMiddleware:
         # that it doesn’t have a response associated.
 
         # Must return only requests (not items).
-        logger.debug(f"Processing start requests for spider: {spider.name}")
+        if logger.isEnabledFor(DEBUG):
+            logger.debug("Processing start requests for spider: %s", spider.name)
         for r in start_requests:
             yield r
 
     def spider_opened(self, spider):
-        logger.info(f"Spider opened: {spider.name}")
+        logger.info("Spider opened: %s", spider.name)
 
 
 class TouristEventsDownloaderMiddleware:
@@ -85,7 +118,8 @@ class TouristEventsDownloaderMiddleware:
         # - or return a Request object
         # - or raise IgnoreRequest: process_exception() methods of
         #   installed downloader middleware will be called
-        logger.debug(f"Processing request: {request.method} {request.url}")
+        if logger.isEnabledFor(DEBUG):
+            logger.debug("Processing request: %s %s", request.method, request.url)
         return None
 
     def process_response(self, request, response, spider):
@@ -95,7 +129,8 @@ class TouristEventsDownloaderMiddleware:
         # - return a Response object
         # - return a Request object
         # - or raise IgnoreRequest
-        logger.debug(f"Processing response: {response.status} {response.url}")
+        if logger.isEnabledFor(DEBUG):
+            logger.debug("Processing response: %s %s", response.status, response.url)
         return response
 
     def process_exception(self, request, exception, spider):
@@ -106,8 +141,8 @@ class TouristEventsDownloaderMiddleware:
         # - return None: continue processing this exception
         # - return a Response object: stops process_exception() chain
         # - return a Request object: stops process_exception() chain
-        logger.error(f"Downloader exception for {request.url}: {exception}", exc_info=False) # Set exc_info=True for full traceback
+        logger.error("Downloader exception for %s: %s", request.url, exception, exc_info=False) # Set exc_info=True for full traceback
         pass
 
     def spider_opened(self, spider):
-        logger.info(f"Spider opened (in Downloader Middleware): {spider.name}")
\ No newline at end of file
+        logger.info("Spider opened (in Downloader Middleware): %s", spider.name)
\ No newline at end of file
@@ -3,6 +3,10 @@
 # Don't forget to add your pipeline to the ITEM_PIPELINES setting
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
+import hashlib
+import queue
+import threading
+
 from itemadapter import ItemAdapter
 from ..utils.logger import get_logger
 from ..processor.event_processor import EventProcessor
@@ -18,56 +22,147 @@ class TouristEventsPipeline:
     This pipeline processes scraped items, sends them to the EventProcessor,
     and saves the resulting Event object using EventStorage.
     """
+    # Sentinel pushed on the queue to tell the worker thread to stop
+    _SENTINEL = object()
+
     def __init__(self):
         self.processor = None
         self.storage = None
+        self._buffer = []
+        self._batch_size = 50
+        self._queue = None
+        self._worker = None
+        self._process_batch_size = 16
+        # Content fingerprints of already-processed items; listing pages often
+        # surface the same event under several URLs, and re-running the full
+        # NLP pipeline on those duplicates is wasted work.
+        self._fp_seen = set()
 
     def open_spider(self, spider):
-        logger.info(f"Opening pipeline for spider: {spider.name}")
+        logger.info("Opening pipeline for spider: %s", spider.name)
+        # Batch sizes are configurable per crawl via settings
+        self._batch_size = spider.settings.getint('EVENT_STORAGE_BATCH_SIZE', 50)
+        self._process_batch_size = spider.settings.getint('EVENT_PROCESS_BATCH_SIZE', 16)
         try:
             # Initialize processor and storage here
             self.processor = EventProcessor()
             self.storage = EventStorage() # Use default path or get from settings
             logger.info("EventProcessor and EventStorage initialized in pipeline.")
         except Exception as e:
-            logger.critical(f"Failed to initialize processor/storage in pipeline: {e}", exc_info=True)
+            logger.critical("Failed to initialize processor/storage in pipeline: %s", e, exc_info=True)
             # Depending on severity, you might want to stop the spider
             # raise NotConfigured("Pipeline could not be initialized.")
             self.processor = None # Ensure it's None if failed
             self.storage = None
+            return
+
+        # Processing and storage run on a background thread so the reactor
+        # keeps downloading while NLP/disk work happens; the bounded queue
+        # applies backpressure if the worker falls far behind.
+        self._queue = queue.Queue(maxsize=500)
+        self._worker = threading.Thread(
+            target=self._worker_loop,
+            name=f"pipeline-worker-{spider.name}",
+            daemon=True,
+        )
+        self._worker.start()
 
     def close_spider(self, spider):
-        logger.info(f"Closing pipeline for spider: {spider.name}")
-        # No explicit cleanup needed for processor/storage in this implementation
+        logger.info("Closing pipeline for spider: %s", spider.name)
+        if self._worker is not None:
+            # Let the worker drain the queue, then flush what remains
+            self._queue.put(self._SENTINEL)
+            self._worker.join()
+            self._worker = None
+        self._flush_buffer()
+
+    def _worker_loop(self):
+        """Drains scraped items off the queue, processes and buffers them."""
+        # Items are accumulated and handed to the processor in batches so
+        # its worker pool can overlap the per-event OpenAI round trips.
+        pending = []
+        while True:
+            try:
+                item = self._queue.get(timeout=2.0)
+            except queue.Empty:
+                # Crawl is trickling; don't sit on a partial batch
+                self._process_pending(pending)
+                continue
+            if item is self._SENTINEL:
+                self._process_pending(pending)
+                break
+            adapter = ItemAdapter(item)
+            fingerprint = self._item_fingerprint(adapter)
+            if fingerprint in self._fp_seen:
+                logger.debug("Skipping duplicate item content: %s", adapter.get('source_url'))
+                continue
+            pending.append((item, fingerprint))
+            if len(pending) >= self._process_batch_size:
+                self._process_pending(pending)
+
+    def _process_pending(self, pending):
+        """Runs one processor batch and buffers the resulting events."""
+        if not pending:
+            return
+        items = [item for item, _ in pending]
+        try:
+            processed = self.processor.process_batch(items)
+        except Exception as e:
+            logger.error("Error during batch processing of %s items: %s", len(items), e, exc_info=True)
+            pending.clear()
+            return
+        for (item, fingerprint), processed_event in zip(pending, processed):
+            if processed_event:
+                self._fp_seen.add(fingerprint)
+                # Buffer the processed event; storage writes happen in
+                # batches to amortize the per-save disk cost.
+                logger.debug("Buffering processed event: %s", processed_event.title)
+                self._buffer.append(processed_event)
+            else:
+                adapter = ItemAdapter(item)
+                logger.warning("Event processing returned None for item: %s. Item might be skipped or invalid.", adapter.get('source_url'))
+        pending.clear()
+        if len(self._buffer) >= self._batch_size:
+            self._flush_buffer()
+
+    def _flush_buffer(self):
+        """Saves all buffered events in a single batched storage call."""
+        if not self._buffer:
+            return
+        try:
+            logger.info("Flushing %d buffered events to storage.", len(self._buffer))
+            self.storage.save_events(self._buffer)
+        except Exception as e:
+            logger.error("Error flushing event buffer to storage: %s", e, exc_info=True)
+        finally:
+            self._buffer = []
+
+    @staticmethod
+    def _item_fingerprint(adapter) -> str:
+        """Content hash over the fields that determine processing output."""
+        raw = "|".join((
+            adapter.get('title') or '',
+            adapter.get('date_text') or '',
+            adapter.get('description') or '',
+        ))
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
 
     def process_item(self, item, spider):
         """
-        Processes a single item scraped by the spider.
-        Processes a scraped item using EventProcessor and saves it via EventStorage.
+        Hands a scraped item to the background worker for processing and
+        batched storage, returning immediately so crawling isn't blocked
+        on NLP or disk I/O.
         """
         if not self.processor or not self.storage:
             logger.error("Processor or Storage not initialized. Skipping item processing.")
             return item # Or raise DropItem
 
         adapter = ItemAdapter(item)
-        logger.debug(f"Pipeline received item from {spider.name}: {adapter.get('title')}")
-
-        try:
-            # Process the raw item
-            processed_event = self.processor.process_event(item)
-
-            if processed_event:
-                # Save the processed event
-                logger.debug(f"Attempting to save processed event: {processed_event.title}")
-                self.storage.save_events([processed_event]) # save_events expects a list
-            else:
-                logger.warning(f"Event processing returned None for item: {adapter.get('source_url')}. Item might be skipped or invalid.")
-                # Optionally drop the item if processing fails consistently
-                # raise DropItem(f"Failed to process event: {adapter.get('source_url')}")
-
-        except Exception as e:
-            logger.error(f"Error during pipeline processing for item {adapter.get('source_url')}: {e}", exc_info=True)
-            # Depending on the error, you might drop the item or let it pass
-            # raise DropItem(f"Pipeline error: {e}")
+        # Drop junk before it ever reaches the (heavy) EventProcessor; this
+        # also surfaces extraction bugs via Scrapy's dropped_items stat.
+        if not adapter.get('title') or not adapter.get('source_url'):
+            raise DropItem(f"Missing essential fields (title/source_url): {adapter.get('source_url')}")
 
+        logger.debug("Pipeline received item from %s: %s", spider.name, adapter.get('title'))
+        self._queue.put(item)
         return item # Return original item (standard practice)
\ No newline at end of file
@@ -1,9 +1,24 @@
 import scrapy
+from lxml.etree import XPath
+from parsel.csstranslator import HTMLTranslator
 from .base_spider import BaseEventSpider
 from ...utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+try:
+    import orjson as _json # C-level JSON decoding for the JSON-LD blobs
+except ImportError:
+    import json as _json
+
+# Translate CSS selectors to XPath once at import time; response.css() would
+# re-run the cssselect translation on every call in the parse hot path.
+_css_to_xpath = HTMLTranslator().css_to_xpath
+
+# JSON-LD @type values we extract event data from; frozenset membership is
+# O(1) instead of rebuilding and scanning a list per page.
+_TARGET_TYPES = frozenset({'Article', 'Event', 'NewsArticle'})
+
 class AmalfiNewsSpider(BaseEventSpider):
     """
     Spider to scrape events from amalfinews.it.
@@ -25,9 +40,20 @@ class AmalfiNewsSpider(BaseEventSpider):
     NEXT_PAGE_SELECTOR = 'a.next.page-numbers::attr(href)' # Selector for the pagination link (List page)
     # --- END PLACEHOLDER SELECTORS ---
 
+    # Compiled once at class load and evaluated straight against the lxml
+    # root: skips per-call CSS translation and SelectorList wrapping.
+    _LINKS_XPATH = XPath('//div[contains(@class,"partialChannelArticlesItems")]//h3/a/@href')
+    _JSONLD_XPATH = XPath('string(//script[@type="application/ld+json"][1]/text())')
+    NEXT_PAGE_XPATH = _css_to_xpath(NEXT_PAGE_SELECTOR)
+
     # Limit items per start URL (optional, adjust as needed)
     MAX_ITEMS_PER_URL = 15
-    _items_scraped_count = 0 # Counter for scraped items
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Per-instance counter of successfully yielded items (a class
+        # attribute would leak across crawls in the same process).
+        self._items_scraped_count = 0
 
     def parse(self, response, **kwargs):
         """
@@ -35,32 +61,34 @@ class AmalfiNewsSpider(BaseEventSpider):
         Finds links to individual event pages and yields requests for them.
         Also handles pagination.
         """
-        logger.info(f"Parsing event list page: {response.url}")
-        event_links = response.css(self.EVENT_LIST_SELECTOR).css(self.EVENT_LINK_SELECTOR).getall()
+        logger.info("Parsing event list page: %s", response.url)
+        # One compiled-XPath pass instead of the css().css() double traversal
+        event_links = self._LINKS_XPATH(response.selector.root)
 
         if not event_links:
-            logger.warning(f"No event links found on {response.url} using selector '{self.EVENT_LIST_SELECTOR} {self.EVENT_LINK_SELECTOR}'")
+            logger.warning("No event links found on %s using XPath '%s'", response.url, self._LINKS_XPATH.path)
             return
 
-        logger.info(f"Found {len(event_links)} potential event links on {response.url}")
+        logger.info("Found %s potential event links on %s", len(event_links), response.url)
 
+        # The budget is charged on successful items in parse_event_details,
+        # not on requests: failed or skipped detail pages no longer eat it.
         for link in event_links:
             if self.MAX_ITEMS_PER_URL and self._items_scraped_count >= self.MAX_ITEMS_PER_URL:
-                logger.info(f"Reached max items limit ({self.MAX_ITEMS_PER_URL}) for {self.name}. Stopping.")
+                logger.info("Reached max items limit (%s) for %s. Stopping.", self.MAX_ITEMS_PER_URL, self.name)
                 return # Stop processing links if limit is reached
 
             absolute_url = response.urljoin(link)
             yield scrapy.Request(absolute_url, callback=self.parse_event_details)
-            self._items_scraped_count += 1 # Increment counter after yielding request
 
         # Handle pagination if limit not reached
         if not self.MAX_ITEMS_PER_URL or self._items_scraped_count < self.MAX_ITEMS_PER_URL:
-            next_page = response.css(self.NEXT_PAGE_SELECTOR).get()
+            next_page = response.xpath(self.NEXT_PAGE_XPATH).get()
             if next_page:
-                logger.info(f"Found next page link: {next_page}")
+                logger.info("Found next page link: %s", next_page)
                 yield response.follow(next_page, callback=self.parse)
             else:
-                logger.info(f"No next page link found on {response.url} using selector '{self.NEXT_PAGE_SELECTOR}'")
+                logger.info("No next page link found on %s using selector '%s'", response.url, self.NEXT_PAGE_SELECTOR)
 
 
     def parse_event_details(self, response):
@@ -68,14 +96,18 @@ class AmalfiNewsSpider(BaseEventSpider):
         Parses the details page of a single event by extracting data
         from the JSON-LD script block.
         """
-        logger.info(f"Parsing event details page using JSON-LD: {response.url}")
-        import json # Import json module
+        logger.info("Parsing event details page using JSON-LD: %s", response.url)
 
         # Extract JSON-LD data
         try:
-            json_ld_str = response.xpath('//script[@type="application/ld+json"]/text()').get()
+            # Cheap bytes scan before any DOM work: pages without a JSON-LD
+            # block never pay for selector construction or XPath evaluation.
+            if b'application/ld+json' not in response.body:
+                logger.error("JSON-LD script not found on %s", response.url)
+                return
+            json_ld_str = self._JSONLD_XPATH(response.selector.root)
             if not json_ld_str:
-                logger.error(f"JSON-LD script not found on {response.url}")
+                logger.error("JSON-LD script not found on %s", response.url)
                 return
 
             # The script might contain multiple JSON objects or be wrapped in an array
@@ -83,22 +115,21 @@ class AmalfiNewsSpider(BaseEventSpider):
             json_data = None
             try:
                 # Attempt to parse directly if it's a single object
-                potential_data = json.loads(json_ld_str)
-                if isinstance(potential_data, list):
-                    # If it's a list, search for the main Article/Event
-                    for item in potential_data:
-                        if isinstance(item, dict) and item.get('@type') in ['Article', 'Event', 'NewsArticle']:
-                            json_data = item
-                            break
-                elif isinstance(potential_data, dict) and potential_data.get('@type') in ['Article', 'Event', 'NewsArticle']:
-                    json_data = potential_data
-
-            except json.JSONDecodeError as e:
-                 logger.error(f"Failed to decode JSON-LD on {response.url}: {e}. Content: {json_ld_str[:500]}...")
+                potential_data = _json.loads(json_ld_str)
+                # Normalize to a sequence and stop at the first match so a
+                # trailing pile of unrelated objects is never inspected.
+                candidates = potential_data if isinstance(potential_data, list) else (potential_data,)
+                for item in candidates:
+                    if isinstance(item, dict) and item.get('@type') in _TARGET_TYPES:
+                        json_data = item
+                        break
+
+            except ValueError as e: # Covers both stdlib and orjson decode errors
+                 logger.error("Failed to decode JSON-LD on %s: %s. Content: %s...", response.url, e, json_ld_str[:500])
                  return # Cannot proceed without valid JSON
 
             if not json_data:
-                logger.error(f"Could not find relevant Article/Event object in JSON-LD on {response.url}")
+                logger.error("Could not find relevant Article/Event object in JSON-LD on %s", response.url)
                 return
 
             # Extract data from JSON-LD fields
@@ -120,11 +151,15 @@ class AmalfiNewsSpider(BaseEventSpider):
             # Use helper from base class to create the item
             item = self.create_event_item(data)
             if item:
-                logger.info(f"Successfully parsed event via JSON-LD: {item.get('title', 'N/A')} from {response.url}")
+                logger.info("Successfully parsed event via JSON-LD: %s from %s", item.get('title', 'N/A'), response.url)
                 yield item
+                self._items_scraped_count += 1
+                if self.MAX_ITEMS_PER_URL and self._items_scraped_count >= self.MAX_ITEMS_PER_URL:
+                    logger.info("Reached max items limit (%s) for %s. Closing spider.", self.MAX_ITEMS_PER_URL, self.name)
+                    self.crawler.engine.close_spider(self, 'max_items')
             else:
                 # create_event_item logs warnings if title/source_url are missing
-                logger.warning(f"Failed to create item from JSON-LD on page: {response.url}")
+                logger.warning("Failed to create item from JSON-LD on page: %s", response.url)
 
         except Exception as e:
-            logger.error(f"Error parsing JSON-LD on {response.url}: {e}", exc_info=True)
+            logger.error("Error parsing JSON-LD on %s: %s", response.url, e, exc_info=True)
@@ -1,29 +1,49 @@
 import scrapy
-from abc import ABC, abstractmethod
 from ..items import EventItem  # Assuming EventItem will be defined in items.py
 from ...utils.logger import get_logger
+from ...utils.url_cache import SeenUrlCache
 
 logger = get_logger(__name__)
 
-class BaseEventSpider(scrapy.Spider, ABC):
+class BaseEventSpider(scrapy.Spider):
     """
-    Abstract base class for event spiders.
+    Base class for event spiders.
     Provides common structure and requires subclasses to implement parsing logic.
+    The parse_event_details contract is enforced in __init_subclass__ rather
+    than via abc, avoiding a second metaclass on every spider subclass.
     """
     name = "base_event_spider" # Default name, should be overridden by subclasses
     allowed_domains = [] # Should be overridden by subclasses
     start_urls = [] # Should be overridden by subclasses
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'parse_event_details' not in cls.__dict__:
+            raise TypeError(f"{cls.__name__} must define parse_event_details")
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self._seen_cache = None # Lazily created once settings are available
         # TODO: Load keywords and event types from config for filtering
 
+    @property
+    def seen(self) -> SeenUrlCache:
+        """
+        Persistent URL cache shared across runs, used to skip detail pages
+        that were already scraped. Created lazily because spider settings
+        are not available at __init__ time.
+        """
+        if self._seen_cache is None:
+            cache_path = self.settings.get('URL_CACHE_PATH', 'data/seen_urls.txt')
+            self._seen_cache = SeenUrlCache(cache_path)
+        return self._seen_cache
+
     def parse(self, response, **kwargs):
         """
         Main parsing method. It should yield requests for detail pages or EventItems.
         Subclasses might override this or implement more specific parsing methods.
         """
-        logger.info(f"Parsing page: {response.url}")
+        logger.debug("Parsing page: %s", response.url)
         # Example: Find links to individual event pages
         # event_links = response.css('a.event-link::attr(href)').getall()
         # for link in event_links:
@@ -36,14 +56,14 @@ class BaseEventSpider(scrapy.Spider, ABC):
         raise NotImplementedError(f"{self.__class__.__name__} must implement the 'parse' method.")
 
 
-    @abstractmethod
     def parse_event_details(self, response):
         """
         Parses the details page of a single event.
-        This method MUST be implemented by subclasses.
+        This method MUST be implemented by subclasses (checked at class
+        creation time in __init_subclass__).
         It should extract event details and yield an EventItem.
         """
-        pass
+        raise NotImplementedError
 
     def extract_event_data(self, response):
         """
@@ -63,35 +83,44 @@ class BaseEventSpider(scrapy.Spider, ABC):
             data['description'] = " ".join(data['description']).strip()
         return data
 
+    # Item fields populated by create_event_item, in declaration order
+    _FIELDS = ('title', 'description', 'date_text', 'image_url', 'source_url')
+
     def create_event_item(self, data):
         """
         Creates and populates an EventItem from extracted data.
-        Includes basic filtering logic (can be expanded).
+        Validates essential fields first so invalid data never allocates an item.
         """
         # TODO: Add filtering based on keywords and event types from config
-        item = EventItem()
-        # Ensure strip() is only called on strings, handle None values gracefully
-        title_raw = data.get('title')
-        item['title'] = title_raw.strip() if title_raw else ''
-
-        description_raw = data.get('description')
-        item['description'] = description_raw.strip() if description_raw else ''
-
-        date_text_raw = data.get('date_text')
-        item['date_text'] = date_text_raw.strip() if date_text_raw else '' # Store raw date text for later processing
-
-        image_url_raw = data.get('image_url')
-        item['image_url'] = image_url_raw.strip() if image_url_raw else ''
-
-        source_url_raw = data.get('source_url')
-        item['source_url'] = source_url_raw.strip() if source_url_raw else ''
-
-        if not item['title'] or not item['source_url']:
-            logger.warning(f"Skipping item due to missing title or source URL: {item['source_url']}")
+        title = (data.get('title') or '').strip()
+        source_url = (data.get('source_url') or '').strip()
+        if not title or not source_url:
+            logger.warning("Skipping item due to missing title or source URL: %s", source_url)
             return None # Skip items missing essential info
 
-        logger.info(f"Extracted basic data for: {item['title']}")
+        item = EventItem()
+        # strip() is only called on strings; None and other values become ''
+        for field in self._FIELDS:
+            value = data.get(field)
+            item[field] = value.strip() if isinstance(value, str) else ''
+
+        logger.debug("Extracted basic data for: %s", item['title'])
         return item
 
+    @staticmethod
+    def release_response_body(response):
+        """
+        Drops the raw page bytes and cached selector once extraction is done.
+        Scrapy keeps the Response alive until the callback generator is fully
+        consumed, so on long crawls many large body buffers can pile up; this
+        frees them early. Touches private Response attributes, hence guarded.
+        """
+        if getattr(response, '_cached_selector', None) is not None:
+            response._cached_selector = None
+        if getattr(response, '_body', None):
+            response._body = b''
+
     def closed(self, reason):
-        logger.info(f"Spider {self.name} finished scraping. Reason: {reason}")
\ No newline at end of file
+        if self._seen_cache is not None:
+            self._seen_cache.flush()
+        logger.info("Spider %s finished scraping. Reason: %s", self.name, reason)
\ No newline at end of file
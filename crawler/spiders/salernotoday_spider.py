@@ -1,9 +1,32 @@
+import asyncio
+import re
+import threading
+from urllib.parse import urljoin
+
 import scrapy
+from lxml import html as lxml_html
+from lxml.etree import XPath
+from parsel.csstranslator import HTMLTranslator
 from .base_spider import BaseEventSpider
 from ...utils.logger import get_logger
 
+try:
+    import orjson as _json # 2-3x faster JSON decoding when available
+except ImportError:
+    import json as _json
+
 logger = get_logger(__name__)
 
+# Translate CSS selectors to XPath once at import time; response.css() would
+# re-run the cssselect translation on every call in the parse hot path.
+_css_to_xpath = HTMLTranslator().css_to_xpath
+
+# Compiled once; collapses runs of whitespace in extracted descriptions
+_WS_RE = re.compile(r'\s+')
+
+# JSON-LD @type values worth extracting; frozenset gives O(1) membership
+_JSONLD_TYPES = frozenset(('Article', 'Event', 'NewsArticle'))
+
 class SalernoTodaySpider(BaseEventSpider):
     """
     Spider to scrape events from salernotoday.it.
@@ -24,49 +47,56 @@ class SalernoTodaySpider(BaseEventSpider):
     # Pagination (Updated - needs verification on live site)
     NEXT_PAGE_SELECTOR = 'a.c-pagination__arrow--next::attr(href)'
 
+    # Selectors translated once at import time (same pattern as the
+    # ilvescovado/ilportico spiders), reused across every response
+    _ALL_LINKS_XPATH = _css_to_xpath(EVENT_LIST_SELECTOR + ' ' + EVENT_LINK_SELECTOR)
+    NEXT_PAGE_XPATH = _css_to_xpath(NEXT_PAGE_SELECTOR)
+    # Detail-page selectors compiled to lxml XPath objects, evaluated
+    # directly against the selector root (skips parsel's per-call
+    # SelectorList wrapping on the fallback hot path)
+    TITLE_XPATH = XPath(_css_to_xpath(TITLE_SELECTOR))
+    # Matches the content container itself; text_content() then concatenates
+    # its text nodes inside libxml2 instead of a Python join over ::text parts
+    DESCRIPTION_CONTAINER_XPATH = XPath(_css_to_xpath('div.p-entry__content'))
+    DATE_XPATH = XPath(_css_to_xpath(DATE_SELECTOR))
+    IMAGE_XPATH = XPath(_css_to_xpath(IMAGE_SELECTOR))
+    # Compiled once; applied directly to the lxml root for the JSON-LD path
+    _JSON_LD_XPATH = XPath('//script[@type="application/ld+json"]/text()')
+
     def parse(self, response, **kwargs):
         """
         Parses the event listing page for salernotoday.it.
         """
-        logger.info(f"Parsing event list page: {response.url}")
-        events = response.css(self.EVENT_LIST_SELECTOR)
-        if not events:
-            logger.warning(f"No event blocks found on {response.url} using selector '{self.EVENT_LIST_SELECTOR}'")
+        logger.info("Parsing event list page: %s", response.url)
+        # One pre-translated XPath pass over the DOM instead of a per-block
+        # selector loop; links with full details on the list page would need
+        # extract_event_data_from_block instead.
+        event_links = response.xpath(self._ALL_LINKS_XPATH).getall()
+        if not event_links:
+            logger.warning("No event links found on %s using XPath '%s'", response.url, self._ALL_LINKS_XPATH)
             return
 
-        for event_block in events:
-            # SalernoToday might have full details on the list page or require following a link.
-            # This example assumes following a link. Adjust if necessary.
-            event_link = event_block.css(self.EVENT_LINK_SELECTOR).get()
-            if event_link:
-                # Ensure the link is absolute
-                absolute_event_link = response.urljoin(event_link)
-                logger.debug(f"Found event link: {absolute_event_link}")
-                yield response.follow(absolute_event_link, callback=self.parse_event_details)
-            else:
-                # If details are on the list page, parse them directly here
-                # data = self.extract_event_data_from_block(event_block, response.url)
-                # item = self.create_event_item(data)
-                # if item: yield item
-                logger.warning(f"Could not find event link within block: {event_block.get()}")
-
+        # Yield the whole page's detail requests as one batch; follow_all
+        # resolves relative links itself and keeps per-request Python
+        # overhead out of the loop, letting the downloader multiplex them.
+        yield from response.follow_all(event_links, callback=self.parse_event_details)
+        logger.info("Yielded %s event detail requests from %s", len(event_links), response.url)
 
         # Follow pagination
-        next_page = response.css(self.NEXT_PAGE_SELECTOR).get()
+        next_page = response.xpath(self.NEXT_PAGE_XPATH).get()
         if next_page:
             absolute_next_page = response.urljoin(next_page)
-            logger.info(f"Following pagination link: {absolute_next_page}")
+            logger.info("Following pagination link: %s", absolute_next_page)
             yield response.follow(absolute_next_page, callback=self.parse)
         else:
-            logger.info(f"No next page link found on {response.url}")
+            logger.info("No next page link found on %s", response.url)
 
-    def parse_event_details(self, response):
+    async def parse_event_details(self, response):
         """
         Parses the details page of a single event.
         Attempts to extract data from JSON-LD first, falls back to CSS selectors.
         """
-        logger.info(f"Attempting to parse event details page: {response.url}")
-        import json # Import json module
+        logger.info("Attempting to parse event details page: %s", response.url)
 
         data = None
         parsed_via_json_ld = False
@@ -75,28 +105,26 @@ class SalernoTodaySpider(BaseEventSpider):
         try:
             # Look for JSON-LD within script tags
             # Note: CityNews sites sometimes have multiple JSON-LD blocks
-            json_ld_scripts = response.xpath('//script[@type="application/ld+json"]/text()').getall()
+            json_ld_scripts = self._JSON_LD_XPATH(response.selector.root)
             json_data = None
             if json_ld_scripts:
-                logger.debug(f"Found {len(json_ld_scripts)} JSON-LD script(s) on {response.url}")
+                logger.debug("Found %s JSON-LD script(s) on %s", len(json_ld_scripts), response.url)
                 for script_content in json_ld_scripts:
                     try:
-                        potential_data = json.loads(script_content)
-                        # Handle case where JSON-LD is a list of objects
-                        if isinstance(potential_data, list):
-                            for item_obj in potential_data:
-                                if isinstance(item_obj, dict) and item_obj.get('@type') in ['Article', 'Event', 'NewsArticle']:
-                                    json_data = item_obj # Found a relevant object
-                                    break # Use the first relevant one found in the list
-                        # Handle case where JSON-LD is a single object
-                        elif isinstance(potential_data, dict) and potential_data.get('@type') in ['Article', 'Event', 'NewsArticle']:
-                            json_data = potential_data # Found a relevant object
+                        potential_data = _json.loads(script_content)
+                        # Normalize single-object and list payloads to one
+                        # loop instead of branching on the container shape
+                        candidates = potential_data if isinstance(potential_data, list) else (potential_data,)
+                        for item_obj in candidates:
+                            if isinstance(item_obj, dict) and item_obj.get('@type') in _JSONLD_TYPES:
+                                json_data = item_obj # Found a relevant object
+                                break # Use the first relevant one found
 
                         if json_data: # If we found a relevant object in this script, stop searching
                             break
 
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Failed to decode one JSON-LD script on {response.url}: {e}. Trying next script if available.")
+                    except ValueError as e: # covers both json and orjson decode errors
+                        logger.warning("Failed to decode one JSON-LD script on %s: %s. Trying next script if available.", response.url, e)
                         continue # Try the next script tag if decoding fails
 
                 if json_data:
@@ -120,41 +148,24 @@ class SalernoTodaySpider(BaseEventSpider):
                         'source_url': response.url,
                     }
                     parsed_via_json_ld = True
-                    logger.info(f"Successfully extracted data via JSON-LD for: {response.url}")
+                    logger.info("Successfully extracted data via JSON-LD for: %s", response.url)
                 else:
-                     logger.warning(f"JSON-LD found but no suitable Article/Event object on {response.url}")
+                     logger.warning("JSON-LD found but no suitable Article/Event object on %s", response.url)
 
             else:
-                logger.info(f"JSON-LD script not found on {response.url}. Falling back to CSS selectors.")
+                logger.info("JSON-LD script not found on %s. Falling back to CSS selectors.", response.url)
 
         except Exception as e:
-            logger.error(f"Error processing JSON-LD on {response.url}: {e}. Falling back to CSS.", exc_info=True)
+            logger.error("Error processing JSON-LD on %s: %s. Falling back to CSS.", response.url, e, exc_info=True)
 
         # --- Attempt 2: Parse using CSS selectors (Fallback) ---
         if not parsed_via_json_ld:
-            logger.info(f"Parsing event details page using CSS selectors: {response.url}")
-            title = response.css(self.TITLE_SELECTOR).get()
-            description_parts = response.css(self.DESCRIPTION_SELECTOR).getall()
-            date_text_raw = response.css(self.DATE_SELECTOR).get()
-            image_url_relative = response.css(self.IMAGE_SELECTOR).get()
-
-            # Clean up description
-            cleaned_description = None
-            if description_parts:
-                cleaned_description = " ".join(part.strip() for part in description_parts if part.strip()).strip()
-                if not cleaned_description:
-                     logger.warning(f"CSS Description found but became empty after cleaning on {response.url}.")
-            else:
-                logger.warning(f"CSS Description parts not found or empty on {response.url} using selector '{self.DESCRIPTION_SELECTOR}'")
-
-
-            data = {
-                'title': title.strip() if title else None,
-                'description': cleaned_description,
-                'date_text': date_text_raw.strip() if date_text_raw else None,
-                'image_url': response.urljoin(image_url_relative) if image_url_relative else None,
-                'source_url': response.url,
-            }
+            logger.info("Parsing event details page using CSS selectors: %s", response.url)
+            # Pure-CPU extraction runs on a worker thread so the reactor
+            # keeps downloading while lxml parses and cleans this page
+            data = await asyncio.to_thread(_parse_details_css, response.body, response.url)
+            if data.get('description') is None:
+                logger.warning("CSS Description container not found or empty on %s using selector 'div.p-entry__content'", response.url)
 
         # --- Create Item ---
         if data:
@@ -164,17 +175,17 @@ class SalernoTodaySpider(BaseEventSpider):
                 # Log title only if found
                 title_log = item.get('title')
                 if not title_log and not parsed_via_json_ld: # Log CSS title failure specifically
-                     logger.warning(f"Title not found via CSS on {response.url} using selector '{self.TITLE_SELECTOR}'")
+                     logger.warning("Title not found via CSS on %s using selector '%s'", response.url, self.TITLE_SELECTOR)
                 elif not title_log and parsed_via_json_ld: # Log JSON-LD title failure specifically
-                     logger.warning(f"Title (headline) not found via JSON-LD on {response.url}")
+                     logger.warning("Title (headline) not found via JSON-LD on %s", response.url)
 
-                logger.info(f"Successfully parsed event via {log_prefix}: {title_log or 'N/A'} from {response.url}")
+                logger.info("Successfully parsed event via %s: %s from %s", log_prefix, title_log or 'N/A', response.url)
                 yield item
             else:
                 # create_event_item logs warnings if title/source_url are missing after cleaning
-                logger.warning(f"Failed to create item from page: {response.url} (data extracted: {data})")
+                logger.warning("Failed to create item from page: %s (data extracted: %s)", response.url, data)
         else:
-             logger.error(f"Could not extract data using JSON-LD or CSS for page: {response.url}")
+             logger.error("Could not extract data using JSON-LD or CSS for page: %s", response.url)
     # Optional: If details are on the list page, implement this
     # def extract_event_data_from_block(self, block, list_url):
     #     """ Extracts event data directly from a block on the listing page. """
@@ -191,4 +202,48 @@ class SalernoTodaySpider(BaseEventSpider):
     #     else:
     #         data['source_url'] = list_url # Fallback if no specific link
     #     # ... more cleaning ...
-    #     return data
\ No newline at end of file
+    #     return data
+
+# Expressions for the threaded fallback parser, taken from the compiled
+# class-level selectors above. lxml XPath evaluators must not be shared
+# across threads, so each worker thread compiles its own copies once.
+_DETAIL_XPATH_EXPRS = (
+    SalernoTodaySpider.TITLE_XPATH.path,
+    SalernoTodaySpider.DESCRIPTION_CONTAINER_XPATH.path,
+    SalernoTodaySpider.DATE_XPATH.path,
+    SalernoTodaySpider.IMAGE_XPATH.path,
+)
+_thread_xpaths = threading.local()
+
+
+def _parse_details_css(html: bytes, url: str) -> dict:
+    """
+    CSS-fallback extraction as a pure function: page bytes in, data dict
+    out. Runs off the reactor thread, so it builds its own lxml tree and
+    per-thread evaluators instead of touching spider or response state.
+    """
+    compiled = getattr(_thread_xpaths, 'compiled', None)
+    if compiled is None:
+        compiled = tuple(XPath(expr) for expr in _DETAIL_XPATH_EXPRS)
+        _thread_xpaths.compiled = compiled
+    title_xp, desc_xp, date_xp, image_xp = compiled
+
+    root = lxml_html.fromstring(html)
+    title = (title_xp(root) or [None])[0]
+    desc_nodes = desc_xp(root)
+    date_text_raw = (date_xp(root) or [None])[0]
+    image_url_relative = (image_xp(root) or [None])[0]
+
+    # Clean up description: C-level text concatenation plus a single
+    # compiled-regex whitespace collapse
+    cleaned_description = None
+    if desc_nodes:
+        cleaned_description = _WS_RE.sub(' ', desc_nodes[0].text_content()).strip() or None
+
+    return {
+        'title': title.strip() if title else None,
+        'description': cleaned_description,
+        'date_text': date_text_raw.strip() if date_text_raw else None,
+        'image_url': urljoin(url, image_url_relative) if image_url_relative else None,
+        'source_url': url,
+    }
@@ -1,5 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from urllib.parse import urlparse
+
 from .openai_client import OpenAIClient
 from .date_extractor import DateExtractor # To be created
+from .processor_cache import ProcessorCache, content_hash
 from ..storage.models import Event
 from ..utils.logger import get_logger
 from itemadapter import ItemAdapter
@@ -16,77 +21,132 @@ class EventProcessor:
         try:
             self.openai_client = OpenAIClient()
         except ValueError as e:
-            logger.error(f"Failed to initialize OpenAIClient: {e}. Event processing might be limited.")
+            logger.error("Failed to initialize OpenAIClient: %s. Event processing might be limited.", e)
             self.openai_client = None # Allow processor to run without OpenAI for basic tasks
 
         self.date_extractor = DateExtractor() # Initialize date extractor
+        # Persistent OpenAI-output cache keyed by description content, so
+        # re-crawled events skip the API entirely.
+        self.cache = ProcessorCache()
+        # Enrichment is network-bound (two OpenAI round trips per event);
+        # a small pool lets a batch overlap those RTTs instead of paying
+        # them serially. The OpenAI client is thread-safe.
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='event-processor')
         logger.info("EventProcessor initialized.")
 
+    def _extract_fields(self, adapter, source_url) -> dict | None:
+        """
+        CPU-side half of processing: field cleanup, date extraction and
+        domain normalization. No network I/O happens here, so it stays
+        cheap and predictable on the worker pool.
+        """
+        title = adapter.get('title', '').strip()
+        raw_description = adapter.get('description', '').strip()
+        date_text = adapter.get('date_text', '').strip()
+        image_url = adapter.get('image_url', '').strip()
+
+        if not title:
+            logger.warning("Skipping event due to missing title: %s", source_url)
+            return None
+
+        extracted_date = self.date_extractor.extract_date(date_text)
+        if not extracted_date:
+            logger.warning("Could not extract date from '%s' for event: %s", date_text, title)
+
+        # Normalize the source domain once at processing time so readers
+        # never have to urlparse at request time
+        try:
+            source_domain = urlparse(source_url).netloc.removeprefix('www.') or None
+        except ValueError:
+            source_domain = None
+
+        return {
+            'title': title,
+            'raw_description': raw_description,
+            'date': extracted_date,
+            'image_url': image_url if image_url else None,
+            'source_domain': source_domain,
+        }
+
+    def _enrich(self, title, raw_description):
+        """
+        I/O-side half: OpenAI summary and type detection, behind the
+        content cache — identical descriptions seen on a previous crawl
+        cost one sqlite lookup instead of two API round trips.
+        """
+        english_summary = None
+        event_type = None
+        cache_key = content_hash(raw_description) if raw_description else None
+        cached = self.cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            english_summary, event_type = cached
+            logger.debug("Enrichment cache hit for event: %s", title)
+        elif self.openai_client:
+            # One fused completion returns the summary and the type
+            # together: the description is sent (and billed) once.
+            # TODO: Get possible types from config
+            enriched = self.openai_client.enrich_event(f"{title}\n\n{raw_description}",
+                                                       min_chars=300, max_chars=500)
+            if enriched:
+                english_summary = enriched.get('english_summary')
+                event_type = enriched.get('event_type')
+            if not english_summary:
+                logger.warning("Failed to generate English summary for event: %s. Falling back.", title)
+            if cache_key and (english_summary or event_type):
+                self.cache.put(cache_key, english_summary, event_type)
+        else:
+            logger.warning("OpenAI client not available, skipping summary and type enrichment.")
+        return english_summary, event_type
+
     def process_event(self, raw_event_item) -> Event | None:
         """
         Takes a raw event item (from Scrapy pipeline) and processes it
-        into a structured Event object.
+        into a structured Event object. Split into a CPU extraction step
+        and a network enrichment step so each can be scheduled (and later
+        optimized) independently.
         """
         adapter = ItemAdapter(raw_event_item)
         source_url = adapter.get('source_url', 'Unknown Source')
-        logger.info(f"Processing event from: {source_url}")
+        logger.info("Processing event from: %s", source_url)
 
         try:
-            title = adapter.get('title', '').strip()
-            raw_description = adapter.get('description', '').strip()
-            date_text = adapter.get('date_text', '').strip()
-            image_url = adapter.get('image_url', '').strip()
-
-            if not title:
-                logger.warning(f"Skipping event due to missing title: {source_url}")
+            fields = self._extract_fields(adapter, source_url)
+            if fields is None:
                 return None
 
-            # 1. Generate English Summary (using OpenAIClient)
-            english_summary = None
-            if self.openai_client:
-                english_summary = self.openai_client.generate_english_summary(raw_description, min_chars=300, max_chars=500)
-                if not english_summary:
-                    logger.warning(f"Failed to generate English summary for event: {title}. Falling back.")
-            else:
-                 logger.warning("OpenAI client not available, skipping English summary generation.")
-            
-            # Keep original description
-            processed_description = raw_description
-
-
-            # 2. Extract Date (using DateExtractor)
-            extracted_date = self.date_extractor.extract_date(date_text)
-            if not extracted_date:
-                 logger.warning(f"Could not extract date from '{date_text}' for event: {title}")
-
+            english_summary, event_type = self._enrich(fields['title'], fields['raw_description'])
 
-            # 3. Detect Event Type (using OpenAIClient)
-            event_type = None
-            if self.openai_client:
-                # TODO: Get possible types from config
-                event_type = self.openai_client.detect_event_type(f"{title} {raw_description}")
-            else:
-                logger.warning("OpenAI client not available, skipping event type detection.")
-
-
-            # 4. Create Final Event Object
             final_event = Event(
-                title=title,
-                description=processed_description, # Keep original description
+                title=fields['title'],
+                description=fields['raw_description'], # Keep original description
                 summary_en=english_summary, # Store the generated summary
-                date=extracted_date,
-                image_url=image_url if image_url else None,
+                date=fields['date'],
+                image_url=fields['image_url'],
                 source_url=source_url,
+                source_domain=fields['source_domain'],
                 event_type=event_type if event_type else "Unknown"
             )
 
-            logger.info(f"Successfully processed event: {final_event.title} (ID: {final_event.id})")
+            logger.info("Successfully processed event: %s (ID: %s)", final_event.title, final_event.id)
             return final_event
 
         except Exception as e:
-            logger.error(f"Error processing event from {source_url}: {e}", exc_info=True)
+            logger.error("Error processing event from %s: %s", source_url, e, exc_info=True)
             return None
 
+    def process_batch(self, raw_event_items) -> List[Optional[Event]]:
+        """
+        Processes a batch of raw items concurrently on the worker pool.
+        Returns one result per input item, in order (None where processing
+        failed), so callers can line results up with their inputs.
+        """
+        if not raw_event_items:
+            return []
+        if len(raw_event_items) == 1: # Skip pool dispatch for singletons
+            return [self.process_event(raw_event_items[0])]
+        logger.info("Processing batch of %d events.", len(raw_event_items))
+        return list(self._pool.map(self.process_event, raw_event_items))
+
 # Example usage (optional)
 if __name__ == '__main__':
     # Mock raw item
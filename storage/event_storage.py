@@ -1,89 +1,208 @@
+import asyncio
+import heapq
 import json
 import os
 import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import Iterator, List, Dict, Optional
+from urllib.parse import urlparse
 
 from .models import Event
 from ..utils.logger import get_logger
 
+try:
+    import orjson as _orjson # C-level serializer, much faster than stdlib json
+except ImportError:
+    _orjson = None
+
 logger = get_logger(__name__)
 
+
+@lru_cache(maxsize=1024)
+def _domain(url: str) -> str:
+    """Normalized netloc for a source URL; repeated URLs skip the re-parse."""
+    try:
+        return urlparse(url).netloc.removeprefix('www.') or 'unknown'
+    except ValueError:
+        return 'unknown'
+
+
+def _dumps_line(data: Dict) -> bytes:
+    """Serializes one event dict to a newline-terminated JSONL line."""
+    if _orjson is not None:
+        return _orjson.dumps(data, option=_orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=False) + '\n').encode('utf-8')
+
 class EventStorage:
     """
-    Handles storing and retrieving Event objects using a JSON file.
+    Handles storing and retrieving Event objects using a newline-delimited
+    JSON (JSONL) file: one event dict per line. New events are appended,
+    so a save costs O(new events) instead of rewriting the whole file.
     Includes basic thread safety for file operations.
     """
-    def __init__(self, storage_path: str = "data/events.json"):
+    def __init__(self, storage_path: str = "data/events.jsonl"):
         self.storage_path = storage_path
         self.lock = threading.Lock() # Lock for thread-safe file access
         self._ensure_storage_file_exists()
-        logger.info(f"EventStorage initialized with path: {self.storage_path}")
+        # Parsed-Event cache keyed by ID, rebuilt only when the file mtime
+        # changes and patched in-place on writes.
+        self._cache: Optional[Dict[str, Event]] = None
+        self._cache_mtime: float = 0.0
+        # Filter indexes maintained alongside the cache: event_type -> ids,
+        # plus a sorted (date, id) list for bisect-based date ranges.
+        self._by_type: Dict[str, set] = defaultdict(set)
+        self._by_date: List[tuple] = []
+        # IDs already on disk, streamed from the raw rows exactly once at
+        # init; keeps duplicate checks O(1) per save without re-reading the
+        # file or eagerly parsing every row into an Event. The exact set is
+        # small enough (a UUID string per event) that a Bloom-filter
+        # pre-check would add a dependency without a measurable win at this
+        # corpus size.
+        self._known_ids = {data.get('id') for data in self._iter_events()}
+        logger.info("EventStorage initialized with path: %s", self.storage_path)
 
     def _ensure_storage_file_exists(self):
         """Creates the storage file and its directory if they don't exist."""
         os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
         if not os.path.exists(self.storage_path):
-            logger.warning(f"Storage file not found at {self.storage_path}. Creating an empty file.")
+            logger.warning("Storage file not found at %s. Creating an empty file.", self.storage_path)
             with self.lock:
                 try:
-                    with open(self.storage_path, 'w', encoding='utf-8') as f:
-                        json.dump([], f) # Initialize with an empty list
+                    with open(self.storage_path, 'w', encoding='utf-8'):
+                        pass # An empty JSONL file is simply an empty file
                 except IOError as e:
-                    logger.error(f"Failed to create storage file {self.storage_path}: {e}")
+                    logger.error("Failed to create storage file %s: %s", self.storage_path, e)
                     raise # Re-raise the exception as this is critical
 
-    def _load_events(self) -> List[Dict]:
-        """Loads raw event data (dictionaries) from the JSON file."""
-        with self.lock:
-            try:
-                with open(self.storage_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if not content: # Handle empty file
-                        return []
-                    data = json.loads(content)
+    def _iter_events(self):
+        """
+        Streams raw event dicts from the JSONL file one line at a time, so
+        consumers that filter or early-return never hold the whole store in
+        memory. Deliberately lock-free: writers only append whole lines or
+        swap the file atomically via os.replace, so a concurrent read sees a
+        consistent prefix at worst and never blocks on an in-progress save.
+        """
+        try:
+            with open(self.storage_path, 'r', encoding='utf-8') as f:
+                first = f.read(1)
+                if not first: # Handle empty file
+                    return
+                if first == '[':
+                    # Legacy pre-JSONL file holding a single JSON array
+                    data = json.loads(first + f.read())
                     if isinstance(data, list):
-                        return data
-                    else:
-                        logger.error(f"Invalid format in storage file {self.storage_path}. Expected a list, got {type(data)}. Returning empty list.")
-                        return []
-            except (IOError, json.JSONDecodeError) as e:
-                logger.error(f"Error loading events from {self.storage_path}: {e}")
-                return [] # Return empty list on error to prevent crashes
-
-    def _save_events(self, events_data: List[Dict]):
-        """Saves raw event data (dictionaries) to the JSON file."""
+                        yield from data
+                    return
+                f.seek(0)
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except (IOError, json.JSONDecodeError) as e:
+            logger.error("Error loading events from %s: %s", self.storage_path, e)
+
+    def _load_events(self) -> List[Dict]:
+        """Loads all raw event data (dictionaries) from the JSONL file."""
+        return list(self._iter_events())
+
+    def _ensure_cache(self) -> Dict[str, Event]:
+        """
+        Returns the parsed-Event cache keyed by ID, rebuilding it only when
+        the storage file's mtime changed since the last build. Repeated reads
+        then skip both the disk read and per-row Event.from_dict parsing.
+        """
+        try:
+            mtime = os.path.getmtime(self.storage_path)
+        except OSError:
+            mtime = 0.0
+        if self._cache is None or mtime != self._cache_mtime:
+            events_data = self._load_events()
+            with self.lock:
+                self._cache = {data.get('id'): Event.from_dict(data) for data in events_data if data}
+                self._cache_mtime = mtime
+                self._rebuild_indexes()
+        return self._cache
+
+    def _rebuild_indexes(self):
+        """Rebuilds the type and date indexes from the current cache."""
+        by_type = defaultdict(set)
+        by_date = []
+        for event_id, event in self._cache.items():
+            if event.event_type:
+                by_type[event.event_type].add(event_id)
+            if event.date:
+                by_date.append((event.date.date(), event_id))
+        by_date.sort()
+        self._by_type = by_type
+        self._by_date = by_date
+
+    def _index_event(self, event: Event):
+        """Adds a single event to the filter indexes."""
+        if event.event_type:
+            self._by_type[event.event_type].add(event.id)
+        if event.date:
+            insort(self._by_date, (event.date.date(), event.id))
+
+    def _rewrite_events(self, events_data: List[Dict]):
+        """
+        Rewrites the whole JSONL file (used only by cleanup paths).
+        Writes to a temp file swapped in with os.replace so a failure can
+        never leave a truncated storage file behind.
+        """
         with self.lock:
+            tmp_path = self.storage_path + '.tmp'
             try:
-                with open(self.storage_path, 'w', encoding='utf-8') as f:
-                    json.dump(events_data, f, indent=4, ensure_ascii=False)
+                with open(tmp_path, 'wb') as f:
+                    for data in events_data:
+                        f.write(_dumps_line(data))
+                os.replace(tmp_path, self.storage_path)
             except IOError as e:
-                logger.error(f"Error saving events to {self.storage_path}: {e}")
+                logger.error("Error saving events to %s: %s", self.storage_path, e)
+                if os.path.exists(tmp_path):
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
 
     def save_events(self, new_events: List[Event]):
         """
-        Saves a list of new Event objects to the storage.
-        Avoids duplicates based on event ID.
+        Appends a list of new Event objects to the storage.
+        Avoids duplicates based on event ID via the in-memory ID set.
         """
         if not new_events:
             return
 
-        logger.info(f"Attempting to save {len(new_events)} new events.")
-        current_events_data = self._load_events()
-        current_event_ids = {event_data.get('id') for event_data in current_events_data}
-        added_count = 0
-
+        logger.info("Attempting to save %s new events.", len(new_events))
+        to_append = []
         for event in new_events:
-            if event.id not in current_event_ids:
-                current_events_data.append(event.to_dict())
-                current_event_ids.add(event.id)
-                added_count += 1
+            if event.id not in self._known_ids:
+                to_append.append(event)
+                self._known_ids.add(event.id)
             else:
-                logger.debug(f"Event with ID {event.id} already exists. Skipping.")
+                logger.debug("Event with ID %s already exists. Skipping.", event.id)
 
-        if added_count > 0:
-            self._save_events(current_events_data)
-            logger.info(f"Successfully saved {added_count} new events.")
+        if to_append:
+            with self.lock:
+                try:
+                    with open(self.storage_path, 'ab') as f:
+                        for event in to_append:
+                            f.write(event.to_json() + b'\n')
+                except IOError as e:
+                    logger.error("Error appending events to %s: %s", self.storage_path, e)
+                    return
+                # Patch the cache in place rather than invalidating it, so the
+                # next read doesn't pay a full reload and re-parse.
+                if self._cache is not None:
+                    for event in to_append:
+                        self._cache[event.id] = event
+                        self._index_event(event)
+                    try:
+                        self._cache_mtime = os.path.getmtime(self.storage_path)
+                    except OSError:
+                        pass
+            logger.info("Successfully saved %s new events.", len(to_append))
         else:
             logger.info("No new events were added to storage.")
 
@@ -98,43 +217,139 @@ class EventStorage:
         Returns:
             A list of matching Event objects.
         """
-        events_data = self._load_events()
-        events = [Event.from_dict(data) for data in events_data if data] # Recreate objects
+        cache = self._ensure_cache()
 
         if filters:
-            logger.info(f"Applying filters: {filters}")
-            filtered_events = []
+            logger.info("Applying filters: %s", filters)
             min_date = filters.get('min_date')
             max_date = filters.get('max_date')
             event_type = filters.get('event_type')
+            require_summary = filters.get('require_summary')
+
+            candidate_ids = None
+            if event_type:
+                candidate_ids = self._by_type.get(event_type, set())
+
+            if min_date or max_date:
+                # Bisect into the sorted (date, id) index; events without a
+                # date never match a date filter, same as before.
+                lo = bisect_left(self._by_date, (min_date, '')) if min_date else 0
+                hi = bisect_right(self._by_date, (max_date, '\x7f')) if max_date else len(self._by_date)
+                in_range = [event_id for _, event_id in self._by_date[lo:hi]]
+                if candidate_ids is None:
+                    filtered_events = [cache[event_id] for event_id in in_range]
+                else:
+                    filtered_events = [cache[event_id] for event_id in in_range if event_id in candidate_ids]
+            elif candidate_ids is not None:
+                filtered_events = [cache[event_id] for event_id in candidate_ids]
+            else:
+                filtered_events = list(cache.values())
+
+            if require_summary:
+                # Consumers that can only present summarized events (the
+                # bot captions) shouldn't pay grouping/sorting for rows
+                # they would drop at send time.
+                filtered_events = [event for event in filtered_events if event.summary_en]
 
-            for event in events:
-                match = True
-                if event_type and event.event_type != event_type:
-                    match = False
-                if min_date and (not event.date or event.date.date() < min_date):
-                    match = False
-                if max_date and (not event.date or event.date.date() > max_date):
-                    match = False
-                # Add more filter conditions as needed
-
-                if match:
-                    filtered_events.append(event)
-            logger.info(f"Found {len(filtered_events)} events matching filters.")
+            logger.info("Found %s events matching filters.", len(filtered_events))
             return filtered_events
         else:
-            logger.info(f"Retrieved {len(events)} total events (no filters).")
+            events = list(cache.values())
+            logger.info("Retrieved %s total events (no filters).", len(events))
             return events
 
+    async def aget_events(self, filters: Optional[Dict] = None) -> List[Event]:
+        """
+        Async wrapper around get_events for use from the Telegram bot's event
+        loop: the disk read and row parsing run on a worker thread instead of
+        blocking every concurrent chat. With the mtime-checked cache warm,
+        the threaded call returns almost immediately.
+        """
+        return await asyncio.to_thread(self.get_events, filters)
+
+    def iter_events(self, filters: Optional[Dict] = None):
+        """
+        Lazily yields Event objects matching the filters, streaming rows
+        straight off disk. One-pass consumers (like the per-source top-k)
+        hold a constant number of events at a time instead of
+        materializing the whole store; get_events remains the right call
+        when a list (or the warm cache) is wanted.
+        """
+        min_date = filters.get('min_date') if filters else None
+        max_date = filters.get('max_date') if filters else None
+        event_type = filters.get('event_type') if filters else None
+        require_summary = filters.get('require_summary') if filters else None
+        # ISO dates compare correctly as strings; no datetime parsing
+        # needed to reject a non-matching row.
+        min_iso = min_date.isoformat()[:10] if min_date else None
+        max_iso = max_date.isoformat()[:10] if max_date else None
+
+        for event_data in self._iter_events():
+            if event_type and event_data.get('event_type') != event_type:
+                continue
+            if require_summary and not event_data.get('summary_en'):
+                continue
+            if min_iso or max_iso:
+                date_str = event_data.get('date')
+                if not date_str: # Events without a date never match a date filter
+                    continue
+                if min_iso and date_str[:10] < min_iso:
+                    continue
+                if max_iso and date_str[:10] > max_iso:
+                    continue
+            try:
+                yield Event.from_dict(event_data)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning("Skipping malformed event row %s: %s", event_data.get('id'), e)
+
+    def get_top_events_per_source(self, min_date=None, k: int = 2,
+                                  require_summary: bool = True) -> Iterator[Event]:
+        """
+        Yields the k most recent events per source domain (most recent
+        first overall). Grouping lives here, next to the Event cache, so
+        bot handlers fetch ~k * sources rows in one call instead of
+        hydrating and re-sorting the full store per request. The storage
+        backend is a flat JSONL file, so this is an in-memory group-by
+        rather than a SQL window query. Returning an iterator lets
+        callers cap the output with islice without building the tail.
+        """
+        filters = {'require_summary': True} if require_summary else {}
+        if min_date:
+            filters['min_date'] = min_date
+        # Streaming keeps peak memory at O(sources * k) instead of O(N)
+        events = self.iter_events(filters=filters)
+
+        # One O(N) pass with a size-k min-heap per domain: each push/pop is
+        # O(log k) with k=2, instead of buffering and sorting every event
+        # for every source. The event id breaks ties so heap comparisons
+        # never fall through to the (unorderable) Event itself.
+        tops: Dict[str, List] = defaultdict(list)
+        for event in events:
+            domain = event.source_domain
+            if not domain:
+                # Rows written before source_domain existed
+                domain = _domain(event.source_url) if event.source_url else 'unknown'
+            heap = tops[domain]
+            entry = (event.date if event.date else datetime.min, event.id, event)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+        # Each per-source heap is tiny (k entries) and its tuples sort
+        # naturally; sort the runs individually and k-way merge them in
+        # O(total) instead of re-sorting the combined list.
+        runs = [sorted(heap, reverse=True) for heap in tops.values()]
+        return (entry[2] for entry in heapq.merge(*runs, reverse=True))
+
     def get_event_by_id(self, event_id: str) -> Optional[Event]:
         """Retrieves a single event by its ID."""
-        logger.debug(f"Attempting to retrieve event by ID: {event_id}")
-        events_data = self._load_events()
-        for data in events_data:
-            if data.get('id') == event_id:
-                logger.info(f"Found event with ID: {event_id}")
-                return Event.from_dict(data)
-        logger.warning(f"Event with ID {event_id} not found.")
+        logger.debug("Attempting to retrieve event by ID: %s", event_id)
+        event = self._ensure_cache().get(event_id)
+        if event is not None:
+            logger.info("Found event with ID: %s", event_id)
+            return event
+        logger.warning("Event with ID %s not found.", event_id)
         return None
 
     def remove_old_events(self, days_old: int = 30):
@@ -142,36 +357,44 @@ class EventStorage:
         Removes events older than a specified number of days based on their date.
         (Phase 4, Step 3)
         """
-        logger.info(f"Starting removal of events older than {days_old} days.")
-        cutoff_date = datetime.utcnow() - timedelta(days=days_old)
-        current_events_data = self._load_events()
+        logger.info("Starting removal of events older than %s days.", days_old)
+        # ISO date strings compare lexicographically the same way dates do,
+        # so kept rows never pay Event parsing or allocation in this loop.
+        cutoff_iso = (datetime.utcnow() - timedelta(days=days_old)).date().isoformat()
         kept_events_data = []
         removed_count = 0
 
-        for event_data in current_events_data:
-            event = Event.from_dict(event_data)
+        # Stream rows instead of materializing the whole store up front
+        for event_data in self._iter_events():
+            date_str = event_data.get('date')
             # Keep events that have no date or are newer than the cutoff
-            if event.date is None or event.date >= cutoff_date.date(): # Compare date part only
+            if not date_str or date_str[:10] >= cutoff_iso:
                  kept_events_data.append(event_data)
             else:
-                logger.debug(f"Removing old event: {event.title} (Date: {event.date}, ID: {event.id})")
+                logger.debug("Removing old event: %s (Date: %s, ID: %s)", event_data.get('title'), date_str, event_data.get('id'))
                 removed_count += 1
 
         if removed_count > 0:
-            self._save_events(kept_events_data)
-            logger.info(f"Removed {removed_count} old events (older than {cutoff_date.date()}).")
+            self._rewrite_events(kept_events_data)
+            self._known_ids = {data.get('id') for data in kept_events_data}
+            with self.lock:
+                self._cache = {data.get('id'): Event.from_dict(data) for data in kept_events_data if data}
+                self._rebuild_indexes()
+                try:
+                    self._cache_mtime = os.path.getmtime(self.storage_path)
+                except OSError:
+                    pass
+            logger.info("Removed %s old events (older than %s).", removed_count, cutoff_iso)
         else:
             logger.info("No old events found to remove.")
 
 
 # Example usage (optional)
 if __name__ == '__main__':
-    storage = EventStorage(storage_path="data/test_events.json") # Use a test file
-
     # Clean up previous test file if exists
-    if os.path.exists("data/test_events.json"):
-        os.remove("data/test_events.json")
-    storage._ensure_storage_file_exists()
+    if os.path.exists("data/test_events.jsonl"):
+        os.remove("data/test_events.jsonl")
+    storage = EventStorage(storage_path="data/test_events.jsonl") # Use a test file
 
 
     # Create some sample events
@@ -213,5 +436,5 @@ if __name__ == '__main__':
         print(f"- {ev.title} ({ev.date})")
 
     # Clean up test file
-    # os.remove("data/test_events.json")
-    print("\nTest complete. Check data/test_events.json")
\ No newline at end of file
+    # os.remove("data/test_events.jsonl")
+    print("\nTest complete. Check data/test_events.jsonl")
\ No newline at end of file
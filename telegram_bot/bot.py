@@ -1,11 +1,11 @@
 import os
 import asyncio
 from telegram import Update
-from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters
+from telegram.ext import AIORateLimiter, Application, CommandHandler, ContextTypes, MessageHandler, PicklePersistence, filters
 from dotenv import load_dotenv
 
 from ..utils.logger import get_logger
-from .handlers import start, help_command, events_command # Handlers to be created
+from .handlers import start, help_command, events_command, set_event_storage # Handlers to be created
 from ..storage.event_storage import EventStorage # Import storage
 
 logger = get_logger(__name__)
@@ -15,7 +15,7 @@ load_dotenv()
 
 async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Log Errors caused by Updates."""
-    logger.error(f"Update {update} caused error {context.error}", exc_info=context.error)
+    logger.error("Update %s caused error %s", update, context.error, exc_info=context.error)
 
 
 def run_bot():
@@ -28,13 +28,31 @@ def run_bot():
     logger.info("Initializing Telegram Bot...")
 
     # Create the Application and pass it your bot's token.
-    application = Application.builder().token(telegram_token).build()
+    # Persist bot_data/chat_data to disk so per-chat state (caches,
+    # subscriptions) survives restarts instead of being rebuilt cold.
+    persistence = PicklePersistence(filepath='data/bot_state.pkl')
+    # The rate limiter enforces Telegram's 30 msg/s global and per-chat
+    # limits, so handlers can dispatch sends concurrently without pacing
+    # themselves with sleeps.
+    application = (
+        Application.builder()
+        .token(telegram_token)
+        .persistence(persistence)
+        .rate_limiter(AIORateLimiter())
+        .build()
+    )
 
     # --- Persistent storage for context ---
-    # Create an instance of EventStorage (or pass it if created elsewhere)
-    event_storage = EventStorage()
-    application.bot_data["event_storage"] = event_storage
-    logger.info("EventStorage added to bot_data.")
+    # Registered at module scope rather than in bot_data: persistence
+    # pickles bot_data on every flush, and EventStorage holds an
+    # unpicklable threading.Lock (reads hit the JSONL on demand anyway).
+    set_event_storage(EventStorage())
+    # Formatted captions are pure functions of an (immutable, append-only)
+    # event, so they can be shared across every /events call between crawls.
+    application.bot_data.setdefault("caption_cache", {})
+    # Telegram file_ids captured on first photo upload, reused afterwards
+    application.bot_data.setdefault("file_id_cache", {})
+    logger.info("EventStorage registered for handlers.")
     # ------------------------------------
 
     # --- Register Handlers ---
@@ -59,6 +77,6 @@ if __name__ == '__main__':
     try:
         run_bot()
     except ValueError as e:
-        logger.critical(f"Bot failed to start: {e}")
+        logger.critical("Bot failed to start: %s", e)
     except Exception as e:
-        logger.critical(f"An unexpected error occurred while running the bot: {e}", exc_info=True)
\ No newline at end of file
+        logger.critical("An unexpected error occurred while running the bot: %s", e, exc_info=True)
\ No newline at end of file
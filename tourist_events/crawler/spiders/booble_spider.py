@@ -36,7 +36,7 @@ class BoobleSpider(BaseEventSpider):
         Finds links to individual event pages and yields requests for them.
         Also handles pagination.
         """
-        logger.info(f"Parsing event list page: {response.url}")
+        logger.info("Parsing event list page: %s", response.url)
         # Reset counter if it's a new start_url being processed (simple check)
         # A more robust way might involve passing meta info if needed
         if response.url in self.start_urls:
@@ -45,14 +45,14 @@ class BoobleSpider(BaseEventSpider):
         event_links = response.css(self.EVENT_LIST_SELECTOR).css(self.EVENT_LINK_SELECTOR).getall()
 
         if not event_links:
-            logger.warning(f"No event links found on {response.url} using selector '{self.EVENT_LIST_SELECTOR} {self.EVENT_LINK_SELECTOR}'")
+            logger.warning("No event links found on %s using selector '%s %s'", response.url, self.EVENT_LIST_SELECTOR, self.EVENT_LINK_SELECTOR)
             return
 
-        logger.info(f"Found {len(event_links)} potential event links on {response.url}")
+        logger.info("Found %s potential event links on %s", len(event_links), response.url)
 
         for link in event_links:
             if self.MAX_ITEMS_PER_URL and self._items_scraped_count >= self.MAX_ITEMS_PER_URL:
-                logger.info(f"Reached max items limit ({self.MAX_ITEMS_PER_URL}) for {self.name} on {response.url}. Stopping this list page.")
+                logger.info("Reached max items limit (%s) for %s on %s. Stopping this list page.", self.MAX_ITEMS_PER_URL, self.name, response.url)
                 return # Stop processing links for this specific start_url if limit is reached
 
             absolute_url = response.urljoin(link)
@@ -63,17 +63,17 @@ class BoobleSpider(BaseEventSpider):
         if not self.MAX_ITEMS_PER_URL or self._items_scraped_count < self.MAX_ITEMS_PER_URL:
             next_page = response.css(self.NEXT_PAGE_SELECTOR).get()
             if next_page:
-                logger.info(f"Found next page link: {next_page}")
+                logger.info("Found next page link: %s", next_page)
                 yield response.follow(next_page, callback=self.parse)
             else:
-                logger.info(f"No next page link found on {response.url} using selector '{self.NEXT_PAGE_SELECTOR}'")
+                logger.info("No next page link found on %s using selector '%s'", response.url, self.NEXT_PAGE_SELECTOR)
 
     def parse_event_details(self, response):
         """
         Parses the details page of a single event.
         Attempts to extract data from JSON-LD first, falls back to CSS selectors.
         """
-        logger.info(f"Attempting to parse event details page: {response.url}")
+        logger.info("Attempting to parse event details page: %s", response.url)
         import json # Import json module
 
         data = None
@@ -83,7 +83,7 @@ class BoobleSpider(BaseEventSpider):
         try:
             json_ld_str = response.xpath('//script[@type="application/ld+json"]/text()').get()
             if json_ld_str:
-                logger.debug(f"Found JSON-LD script on {response.url}")
+                logger.debug("Found JSON-LD script on %s", response.url)
                 json_data = None
                 try:
                     potential_data = json.loads(json_ld_str)
@@ -110,36 +110,34 @@ class BoobleSpider(BaseEventSpider):
                             'source_url': response.url,
                         }
                         parsed_via_json_ld = True
-                        logger.info(f"Successfully extracted data via JSON-LD for: {response.url}")
+                        logger.info("Successfully extracted data via JSON-LD for: %s", response.url)
                     else:
-                         logger.warning(f"JSON-LD found but no suitable Article/Event object on {response.url}")
+                         logger.warning("JSON-LD found but no suitable Article/Event object on %s", response.url)
 
                 except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to decode JSON-LD on {response.url}: {e}. Falling back to CSS.")
+                    logger.warning("Failed to decode JSON-LD on %s: %s. Falling back to CSS.", response.url, e)
             else:
-                logger.info(f"JSON-LD script not found on {response.url}. Falling back to CSS selectors.")
+                logger.info("JSON-LD script not found on %s. Falling back to CSS selectors.", response.url)
 
         except Exception as e:
-            logger.error(f"Error processing JSON-LD on {response.url}: {e}. Falling back to CSS.", exc_info=True)
+            logger.error("Error processing JSON-LD on %s: %s. Falling back to CSS.", response.url, e, exc_info=True)
 
         # --- Attempt 2: Parse using CSS selectors (Fallback) ---
         if not parsed_via_json_ld:
-            logger.info(f"Parsing event details page using CSS selectors: {response.url}")
+            logger.info("Parsing event details page using CSS selectors: %s", response.url)
             title = response.css(self.TITLE_SELECTOR).get()
             description_parts = response.css(self.DESCRIPTION_SELECTOR).getall()
             date_text_raw = response.css(self.DATE_SELECTOR).get()
             image_url_relative = response.css(self.IMAGE_SELECTOR).get()
 
-            # Clean description parts
-            cleaned_description = None
-            if description_parts:
-                filtered_parts = [part.strip() for part in description_parts if part.strip() and "Inserito da" not in part]
-                if filtered_parts:
-                    cleaned_description = " ".join(filtered_parts).strip()
-                else:
-                    logger.warning(f"CSS Description found but became empty after filtering on {response.url}.")
-            else:
-                logger.warning(f"CSS Description parts not found or empty on {response.url} using selector '{self.DESCRIPTION_SELECTOR}'")
+            # Strip, filter and join in a single generator pass instead of
+            # materializing an intermediate filtered list
+            cleaned_description = " ".join(
+                p for p in (part.strip() for part in description_parts)
+                if p and "Inserito da" not in p
+            ) or None
+            if cleaned_description is None:
+                logger.warning("CSS Description parts not found or empty on %s using selector '%s'", response.url, self.DESCRIPTION_SELECTOR)
 
             data = {
                 'title': title.strip() if title else None,
@@ -154,9 +152,9 @@ class BoobleSpider(BaseEventSpider):
             item = self.create_event_item(data)
             if item:
                 log_prefix = "JSON-LD" if parsed_via_json_ld else "CSS"
-                logger.info(f"Successfully parsed event via {log_prefix}: {item.get('title', 'N/A')} from {response.url}")
+                logger.info("Successfully parsed event via %s: %s from %s", log_prefix, item.get('title', 'N/A'), response.url)
                 yield item
             else:
-                logger.warning(f"Failed to create item from page: {response.url} (data: {data})")
+                logger.warning("Failed to create item from page: %s (data: %s)", response.url, data)
         else:
-             logger.error(f"Could not extract data using JSON-LD or CSS for page: {response.url}")
+             logger.error("Could not extract data using JSON-LD or CSS for page: %s", response.url)
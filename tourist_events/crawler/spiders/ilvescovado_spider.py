@@ -1,9 +1,17 @@
 import scrapy
+from itertools import islice
+from lxml.etree import XPath
+from parsel.csstranslator import HTMLTranslator
+from w3lib.url import canonicalize_url
 from .base_spider import BaseEventSpider
 from ...utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Translate CSS selectors to XPath once at import time; response.css() would
+# re-run the cssselect translation on every call in the parse hot path.
+_css_to_xpath = HTMLTranslator().css_to_xpath
+
 class IlVescovadoSpider(BaseEventSpider):
     """
     Spider to scrape events from ilvescovado.it.
@@ -15,6 +23,18 @@ class IlVescovadoSpider(BaseEventSpider):
         "https://www.ilvescovado.it/it/notizie-lifestyle-47/"
     ]
 
+    # Concurrency tuned for a single target domain: push more parallel
+    # requests than the project defaults and let AutoThrottle hover around
+    # the target instead of the fixed 1s DOWNLOAD_DELAY.
+    custom_settings = {
+        'CONCURRENT_REQUESTS_PER_DOMAIN': 16,
+        'CONCURRENT_REQUESTS': 32,
+        'DOWNLOAD_DELAY': 0.1,
+        'AUTOTHROTTLE_ENABLED': True,
+        'AUTOTHROTTLE_TARGET_CONCURRENCY': 8.0,
+        'REACTOR_THREADPOOL_MAXSIZE': 20,
+    }
+
     # Selectors (Updated based on provided HTML)
     EVENT_LIST_SELECTOR = 'div.partialChannelArticlesItems' # Selector for each event block on the list page
     EVENT_LINK_SELECTOR = 'h3 a::attr(href)' # Selector for the link to the event detail page (relative to EVENT_LIST_SELECTOR)
@@ -23,6 +43,17 @@ class IlVescovadoSpider(BaseEventSpider):
     DATE_SELECTOR = 'p:contains("Inserito da")::text' # Selector for the paragraph containing date info
     IMAGE_SELECTOR = 'img.full::attr(src)' # Selector for the main event image URL
 
+    # Single-pass XPath pulling every event link from the listing page at once
+    _ALL_LINKS_XPATH = '//div[contains(@class,"partialChannelArticlesItems")]//h3/a/@href'
+    # Detail-page selectors compiled to lxml XPath objects, evaluated directly
+    # against the selector root (skips cssselect and SelectorList wrapping)
+    TITLE_XPATH = XPath(_css_to_xpath(TITLE_SELECTOR))
+    DATE_XPATH = XPath(_css_to_xpath(DATE_SELECTOR))
+    IMAGE_XPATH = XPath(_css_to_xpath(IMAGE_SELECTOR))
+    # Description XPath that filters out the "Inserito da" date/author line
+    # inside libxml2 instead of in a Python loop over every text node
+    DESCRIPTION_FILTERED_XPATH = XPath('//div[img[contains(@class,"full")]]/p[not(contains(., "Inserito da"))]//text()')
+
     # Pagination (Placeholder - needs verification, disabled for now due to item limit)
     # NEXT_PAGE_SELECTOR = 'a.next.page-numbers::attr(href)'
 
@@ -36,37 +67,33 @@ class IlVescovadoSpider(BaseEventSpider):
         up to MAX_ITEMS_PER_URL.
         Does not follow pagination to enforce the limit per section easily.
         """
-        logger.info(f"Parsing event list page: {response.url}")
-        events = response.css(self.EVENT_LIST_SELECTOR)
-        if not events:
-            logger.warning(f"No event blocks found on {response.url} using selector '{self.EVENT_LIST_SELECTOR}'")
+        logger.debug("Parsing event list page: %s", response.url)
+        # One XPath pass over the DOM instead of a per-block selector loop
+        links = response.xpath(self._ALL_LINKS_XPATH).getall()
+        if not links:
+            logger.warning("No event links found on %s using XPath '%s'", response.url, self._ALL_LINKS_XPATH)
             return
 
-        items_yielded = 0
-        for event_block in events:
-            if items_yielded >= self.MAX_ITEMS_PER_URL:
-                logger.info(f"Reached item limit ({self.MAX_ITEMS_PER_URL}) for {response.url}. Stopping.")
-                break
+        # Canonicalize (merging fragment/tracking-param variants) and dedupe
+        # the raw hrefs first, so repeated links never reach Request
+        # allocation or the dupefilter's fingerprint hashing.
+        seen_links = set()
+        unique = [url for url in (canonicalize_url(response.urljoin(link)) for link in links)
+                  if not (url in seen_links or seen_links.add(url))]
+        # Cap new detail requests up-front; already-scraped URLs don't eat the budget
+        new_urls = (url for url in unique if not self.seen.contains(url))
+        urls = list(islice(new_urls, self.MAX_ITEMS_PER_URL))
+        yield from response.follow_all(urls, callback=self.parse_event_details)
 
-            event_link = event_block.css(self.EVENT_LINK_SELECTOR).get()
-            if event_link:
-                absolute_event_link = response.urljoin(event_link)
-                logger.debug(f"Found event link: {absolute_event_link}")
-                yield response.follow(absolute_event_link, callback=self.parse_event_details)
-                items_yielded += 1
-            else:
-                # Log if a block is found but doesn't contain the expected link
-                logger.warning(f"Could not find event link within block using selector '{self.EVENT_LINK_SELECTOR}' in block: {event_block.get()}")
-
-        logger.info(f"Finished parsing {response.url}, yielded {items_yielded} item requests.")
+        logger.debug("Finished parsing %s, yielded %d item requests.", response.url, len(urls))
 
         # Pagination is disabled to respect MAX_ITEMS_PER_URL per initial page load
         # next_page = response.css(self.NEXT_PAGE_SELECTOR).get()
         # if next_page and items_yielded < self.MAX_ITEMS_PER_URL: # Optional: only paginate if limit not reached
-        #     logger.info(f"Following pagination link: {next_page}")
+        #     logger.info("Following pagination link: %s", next_page)
         #     yield response.follow(response.urljoin(next_page), callback=self.parse)
         # else:
-        #     logger.info(f"No next page link found or item limit reached on {response.url}")
+        #     logger.info("No next page link found or item limit reached on %s", response.url)
 
 
     def parse_event_details(self, response):
@@ -74,51 +101,44 @@ class IlVescovadoSpider(BaseEventSpider):
         Parses the details page of a single event from ilvescovado.it.
         Extracts event details using defined selectors and yields an EventItem.
         """
-        logger.info(f"Parsing event details page: {response.url}")
+        logger.debug("Parsing event details page: %s", response.url)
 
         # Use helper from base class or define specific extraction logic here
-        # Extract raw data using updated selectors
-        title = response.css(self.TITLE_SELECTOR).get()
-        description_parts = response.css(self.DESCRIPTION_SELECTOR).getall()
-        date_text_raw = response.css(self.DATE_SELECTOR).get()
-        image_url_relative = response.css(self.IMAGE_SELECTOR).get()
+        # Extract raw data using the pre-compiled selectors
+        root = response.selector.root
+        title = (self.TITLE_XPATH(root) or [None])[0]
+        # The "Inserito da" line is already filtered out by the XPath itself
+        description_parts = self.DESCRIPTION_FILTERED_XPATH(root)
+        date_text_raw = (self.DATE_XPATH(root) or [None])[0]
+        image_url_relative = (self.IMAGE_XPATH(root) or [None])[0]
+
+        description = " ".join(p.strip() for p in description_parts if p.strip()) or None
+        if description is None:
+            logger.warning("Description parts not found or empty on %s using XPath '%s'", response.url, self.DESCRIPTION_FILTERED_XPATH.path)
 
         # Create the data dictionary
         data = {
             'title': title.strip() if title else None,
-            'description': description_parts, # Will be joined later
+            'description': description,
             'date_text': date_text_raw.strip() if date_text_raw else None,
             'image_url': response.urljoin(image_url_relative) if image_url_relative else None, # Make URL absolute
             'source_url': response.url,
         }
 
-        # Clean up description (Filter out unwanted lines and join the list from .getall())
-        raw_description_list = data.get('description', [])
-        if raw_description_list:
-            # Filter out the date/author line before joining
-            filtered_parts = [
-                part.strip() for part in raw_description_list
-                if part.strip() and "Inserito da" not in part
-            ]
-            if filtered_parts:
-                 data['description'] = " ".join(filtered_parts).strip()
-            else:
-                 # Log if filtering removed everything (might indicate selector issue)
-                 logger.warning(f"Description found but became empty after filtering 'Inserito da' on {response.url}. Original parts: {raw_description_list}")
-                 data['description'] = None
-        else:
-             logger.warning(f"Description parts not found or empty on {response.url} using selector '{self.DESCRIPTION_SELECTOR}'")
-             data['description'] = None # Ensure it's None if nothing found
 
+        # All extraction is done; free the raw page bytes before the yield
+        # keeps this generator (and the Response) alive in the engine.
+        self.release_response_body(response)
 
         # Use helper from base class to create the item
         item = self.create_event_item(data)
         if item:
             # Perform specific cleaning/validation for this spider if needed
             if not item.get('title'):
-                 logger.warning(f"Title not found or empty on {response.url} using selector '{self.TITLE_SELECTOR}'")
+                 logger.warning("Title not found or empty on %s using selector '%s'", response.url, self.TITLE_SELECTOR)
 
-            logger.info(f"Successfully parsed event: {item.get('title', 'N/A')} from {response.url}")
+            logger.debug("Successfully parsed event: %s from %s", item.get('title', 'N/A'), response.url)
+            self.seen.add(response.url)
             yield item
         else:
-            logger.warning(f"Failed to create item from page: {response.url}")
\ No newline at end of file
+            logger.warning("Failed to create item from page: %s", response.url)
\ No newline at end of file
@@ -1,8 +1,10 @@
 import argparse
 import sys
 import os
-from scrapy.crawler import CrawlerProcess
+from scrapy.crawler import CrawlerRunner
+from scrapy.utils.log import configure_logging
 from scrapy.utils.project import get_project_settings
+from scrapy.utils.reactor import install_reactor
 from dotenv import load_dotenv
 
 # Ensure the project root is in the Python path
@@ -39,60 +41,65 @@ except ImportError as e:
 logger = get_logger(__name__)
 load_dotenv() # Load .env variables for components that need them
 
+# Name -> class registry; new spiders register by being added here (and to
+# the --spiders choices below) instead of growing an if/elif ladder.
+_SPIDER_REGISTRY = {cls.name: cls for cls in (
+    IlVescovadoSpider,
+    SalernoTodaySpider,
+    BoobleSpider,
+    IlPorticoSpider,
+    MaioriNewsSpider,
+    AmalfiNewsSpider,
+)}
+
 def run_crawler(spiders_to_run=None):
     """
     Runs the Scrapy crawler process for specified spiders.
     If no spiders are specified, runs all discovered spiders.
     """
-    logger.info(f"Starting crawler process for spiders: {spiders_to_run or 'all'}")
+    logger.info("Starting crawler process for spiders: %s", spiders_to_run or 'all')
     settings = get_project_settings()
     # Explicitly ensure the pipeline is enabled in the settings passed to CrawlerProcess
     # This can help if settings loading behaves differently when run via CrawlerProcess
     settings['ITEM_PIPELINES'] = {
         "tourist_events.crawler.pipelines.TouristEventsPipeline": 300,
     }
-    logger.debug(f"Using settings for CrawlerProcess: {settings.copy_to_dict()}") # Log settings being used
-    process = CrawlerProcess(settings)
+    logger.debug("Using settings for CrawlerRunner: %s", settings.copy_to_dict()) # Log settings being used
+
+    # CrawlerRunner on an explicitly installed asyncio reactor: all crawls
+    # are scheduled up-front as deferreds and run concurrently on one
+    # reactor, and we own the lifecycle (stop exactly when the last
+    # spider's deferred fires) instead of CrawlerProcess's implicit one.
+    install_reactor(settings.get('TWISTED_REACTOR'))
+    configure_logging(settings)
+    from twisted.internet import defer, reactor
+
+    runner = CrawlerRunner(settings)
 
+    spider_classes = []
     if spiders_to_run:
         for spider_name in spiders_to_run:
-            logger.info(f"Adding spider '{spider_name}' to crawl process.")
-            # Dynamically get spider class - requires correct SPIDER_MODULES in settings.py
-            # This is a bit more complex, for now, we hardcode known spiders
-            if spider_name == 'ilvescovado':
-                 process.crawl(IlVescovadoSpider)
-            elif spider_name == 'salernotoday':
-                 process.crawl(SalernoTodaySpider)
-            elif spider_name == 'booble':
-                 process.crawl(BoobleSpider)
-            elif spider_name == 'ilportico':
-                 process.crawl(IlPorticoSpider)
-            elif spider_name == 'maiorinews':
-                 process.crawl(MaioriNewsSpider)
-            elif spider_name == 'amalfinews':
-                 process.crawl(AmalfiNewsSpider)
-            else:
-                 logger.warning(f"Unknown spider name specified: {spider_name}. Skipping.")
-                 # TODO: Implement dynamic spider loading if needed
+            spider_cls = _SPIDER_REGISTRY.get(spider_name)
+            if spider_cls is None:
+                logger.warning("Unknown spider name specified: %s. Skipping.", spider_name)
+                continue
+            logger.info("Adding spider '%s' to crawl process.", spider_name)
+            spider_classes.append(spider_cls)
     else:
-        logger.info("No specific spiders specified, attempting to run all discovered spiders.")
-        # Scrapy discovers spiders listed in SPIDER_MODULES in settings.py
-        # This requires running scrapy crawlall command or similar logic.
-        # For simplicity here, we explicitly list the known ones.
-        # A better approach might involve using CrawlerRunner for more control.
-        process.crawl(IlVescovadoSpider)
-        process.crawl(SalernoTodaySpider)
-        process.crawl(BoobleSpider)
-        process.crawl(IlPorticoSpider)
-        process.crawl(MaioriNewsSpider)
-        process.crawl(AmalfiNewsSpider)
+        logger.info("No specific spiders specified, running all known spiders.")
+        spider_classes = list(_SPIDER_REGISTRY.values())
 
+    if not spider_classes:
+        logger.warning("No valid spiders to run; nothing to do.")
+        return
 
     try:
-        process.start() # The script will block here until the crawling is finished
+        crawl_deferreds = [runner.crawl(spider_cls) for spider_cls in spider_classes]
+        defer.DeferredList(crawl_deferreds).addBoth(lambda _: reactor.stop())
+        reactor.run() # Blocks until every crawl deferred has fired
         logger.info("Crawler process finished.")
     except Exception as e:
-        logger.error(f"Crawler process failed: {e}", exc_info=True)
+        logger.error("Crawler process failed: %s", e, exc_info=True)
 
 
 def main():
@@ -105,7 +112,7 @@ def main():
     parser.add_argument(
         "--spiders",
         nargs='+',
-        choices=['ilvescovado', 'salernotoday', 'booble', 'ilportico', 'maiorinews', 'amalfinews'], # Add new spider names here
+        choices=sorted(_SPIDER_REGISTRY), # Names come straight from the registry
         help="Specify which spider(s) to run (e.g., --spiders ilvescovado amalfinews). Only used with 'run-crawler'."
     )
     # Add other arguments if needed
@@ -113,7 +120,7 @@ def main():
 
     args = parser.parse_args()
 
-    logger.info(f"Executing command: {args.command}")
+    logger.info("Executing command: %s", args.command)
 
     if args.command == "run-crawler":
         run_crawler(args.spiders)
@@ -121,9 +128,9 @@ def main():
         try:
             run_bot()
         except ValueError as e:
-             logger.critical(f"Bot failed to start: {e}")
+             logger.critical("Bot failed to start: %s", e)
         except Exception as e:
-             logger.critical(f"An unexpected error occurred while running the bot: {e}", exc_info=True)
+             logger.critical("An unexpected error occurred while running the bot: %s", e, exc_info=True)
     elif args.command == "run-all":
         # Example: Run crawler first, then bot (in separate processes ideally)
         logger.info("Running crawler first...")
@@ -132,11 +139,11 @@ def main():
         try:
             run_bot()
         except ValueError as e:
-             logger.critical(f"Bot failed to start: {e}")
+             logger.critical("Bot failed to start: %s", e)
         except Exception as e:
-             logger.critical(f"An unexpected error occurred while running the bot: {e}", exc_info=True)
+             logger.critical("An unexpected error occurred while running the bot: %s", e, exc_info=True)
     else:
-        logger.error(f"Unknown command: {args.command}")
+        logger.error("Unknown command: %s", args.command)
         parser.print_help()
         sys.exit(1)
 
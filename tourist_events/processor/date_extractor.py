@@ -1,9 +1,29 @@
+import re
+from functools import lru_cache
+
+from dateparser.date import DateDataParser
 from dateparser.search import search_dates
 from datetime import datetime
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_IT_MONTHS = {
+    'gennaio': 1, 'febbraio': 2, 'marzo': 3, 'aprile': 4,
+    'maggio': 5, 'giugno': 6, 'luglio': 7, 'agosto': 8,
+    'settembre': 9, 'ottobre': 10, 'novembre': 11, 'dicembre': 12,
+}
+
+# Strict patterns covering the date shapes the source sites actually emit
+# ("25 maggio 2024", "25/05/2024"). Compiled once; each is a cheap C-level
+# search compared with dateparser's multilingual machinery.
+_DATE_PATTERNS = (
+    (re.compile(r'(\d{1,2})\s+(' + '|'.join(_IT_MONTHS) + r')\s+(\d{4})'),
+     lambda m: datetime(int(m.group(3)), _IT_MONTHS[m.group(2)], int(m.group(1)))),
+    (re.compile(r'(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})'),
+     lambda m: datetime(int(m.group(3)), int(m.group(2)), int(m.group(1)))),
+)
+
 class DateExtractor:
     """
     Extracts and parses dates from raw text strings using the dateparser library.
@@ -19,8 +39,44 @@ class DateExtractor:
             'RETURN_AS_TIMEZONE_AWARE': False, # Return naive datetime objects
             # 'DATE_ORDER': 'DMY', # Explicitly set DMY for Italian context if needed
         }
+        self._languages = ['it', 'en'] # Define languages here or load from config
+        other_settings = {k: v for k, v in self.parser_settings.items() if k != 'languages'}
+        # Built once: the language/locale initialization (regex compilation,
+        # dictionary loads) dominates a cold parse, so pay it here instead of
+        # inside every search_dates call.
+        self._parser = DateDataParser(languages=self._languages, settings=other_settings)
+        self._other_settings = other_settings
+        # Many events repeat the same date string; memoize parse results
+        self._parse_cached = lru_cache(maxsize=4096)(self._parse)
         logger.info("DateExtractor initialized with settings: %s", self.parser_settings)
 
+    def _parse(self, text: str):
+        """
+        Parses a single date string. Tries the prebuilt DateDataParser first
+        (covers clean attribute-style values like datePublished), falling back
+        to the much heavier search_dates substring scan for free-form text.
+        """
+        # Strict compiled patterns first; dateparser only sees the text
+        # none of them match (free-form "prossimo martedi" style strings).
+        lowered = text.lower()
+        for pattern, build in _DATE_PATTERNS:
+            match = pattern.search(lowered)
+            if match:
+                try:
+                    return build(match)
+                except ValueError: # e.g. "45/13/2024"; let dateparser judge
+                    break
+
+        date_data = self._parser.get_date_data(text)
+        parsed = date_data.date_obj if date_data else None
+        if parsed is not None:
+            return parsed
+        date_results = search_dates(text, languages=self._languages, settings=self._other_settings)
+        if date_results:
+            # Select the first found date
+            return date_results[0][1]
+        return None
+
     def extract_date(self, text: str) -> datetime | None:
         """
         Extracts the first valid date found in the given text string.
@@ -35,30 +91,32 @@ class DateExtractor:
             logger.warning("Invalid input provided for date extraction.")
             return None
 
-        logger.debug(f"Attempting to extract date from text: '{text}'")
+        # Fast path: JSON-LD datePublished and time[datetime] attributes are
+        # already ISO-8601; the C-implemented fromisoformat handles them
+        # without spinning up any multilingual parsing machinery.
         try:
-            # Use search_dates which is better for finding dates within larger text blocks
-            # It returns a list of tuples: (original_string, datetime_object)
-            # Pass languages separately, extract other settings
-            languages = ['it', 'en'] # Define languages here or load from config
-            other_settings = {k: v for k, v in self.parser_settings.items() if k != 'languages'}
-            date_results = search_dates(text, languages=languages, settings=other_settings)
-
-            if date_results:
-                # Select the first found date
-                original_str, parsed_date = date_results[0]
-                logger.info(f"Successfully extracted date '{parsed_date}' from substring '{original_str}' in text: '{text}'")
+            parsed = datetime.fromisoformat(text.strip().replace('Z', '+00:00'))
+            return parsed.replace(tzinfo=None) # Storage expects naive datetimes
+        except ValueError:
+            pass
+
+        logger.debug("Attempting to extract date from text: '%s'", text)
+        try:
+            parsed_date = self._parse_cached(text)
+
+            if parsed_date is not None:
+                logger.info("Successfully extracted date '%s' from text: '%s'", parsed_date, text)
                 # Ensure it's a datetime object (dateparser might return date)
                 if isinstance(parsed_date, datetime):
                     return parsed_date
                 else: # Handle cases where only date part is parsed
                     return datetime.combine(parsed_date, datetime.min.time())
             else:
-                logger.warning(f"Could not find any valid date in text: '{text}'")
+                logger.warning("Could not find any valid date in text: '%s'", text)
                 return None
 
         except Exception as e:
-            logger.error(f"Error during date extraction from text '{text}': {e}", exc_info=True)
+            logger.error("Error during date extraction from text '%s': %s", text, e, exc_info=True)
             return None
 
 # Example usage (optional)
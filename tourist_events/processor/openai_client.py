@@ -1,10 +1,84 @@
+import asyncio
+import io
+import json
 import os
+import ssl
+import time
+from functools import lru_cache
+
+import httpx
 import openai
 from dotenv import load_dotenv
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+from .processor_cache import ProcessorCache, content_hash
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Shared ceiling for all async OpenAI traffic from this process
+_MAX_CONCURRENCY = 10
+_REQUESTS_PER_MINUTE = 300
+
+# gpt-4o-mini is ~3x cheaper per input token than gpt-3.5-turbo with a
+# higher per-minute throughput ceiling; override via OPENAI_MODEL if a
+# different trade-off is wanted. The model name is part of the summary
+# cache key, so changing it invalidates cached summaries as it should.
+_SUMMARY_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+# Fixed seed: best-effort deterministic outputs, so retries and parallel
+# runs converge on the same summaries the cache already holds.
+_SUMMARY_SEED = 42
+
+# Transient failures worth retrying: 429s and network/timeout blips
+# usually succeed on a later attempt, so backing off beats dropping the
+# event. BadRequestError and friends are not listed — a malformed
+# request fails identically every time.
+_RETRYABLE_ERRORS = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError)
+_RETRY_KWARGS = dict(
+    retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+    wait=wait_random_exponential(min=1, max=30), # Jittered so concurrent chunks don't retry in lockstep
+    stop=stop_after_attempt(6),
+    reraise=True,
+)
+
+
+class _TokenBucket:
+    """
+    Minimal async token bucket: refills at a fixed rate, callers await
+    acquire() before each request so bursts never exceed the configured
+    requests-per-minute budget.
+    """
+
+    def __init__(self, rate_per_sec: float, capacity: float):
+        self._rate = rate_per_sec
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self._rate)
+
+
+_semaphore = asyncio.Semaphore(_MAX_CONCURRENCY)
+_bucket = _TokenBucket(rate_per_sec=_REQUESTS_PER_MINUTE / 60.0, capacity=_MAX_CONCURRENCY)
+
+# One SSL context and one pooled transport per process: building a context
+# re-reads the CA bundle off disk, and a fresh connection pays a full TLS
+# handshake — shared keep-alive pools make both one-time costs.
+_SHARED_SSL = ssl.create_default_context()
+_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+_POOL_TIMEOUT = httpx.Timeout(60.0)
+_SHARED_HTTP = httpx.Client(verify=_SHARED_SSL, limits=_POOL_LIMITS, timeout=_POOL_TIMEOUT)
+_SHARED_AHTTP = httpx.AsyncClient(verify=_SHARED_SSL, limits=_POOL_LIMITS, timeout=_POOL_TIMEOUT)
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -20,18 +94,62 @@ class OpenAIClient:
             raise ValueError("Missing OpenAI API Key")
         # Initialize the OpenAI client instance (v1.0.0+ syntax)
         try:
-            self.client = openai.OpenAI(api_key=self.api_key)
+            self.client = openai.OpenAI(api_key=self.api_key, http_client=_SHARED_HTTP)
+            # Async twin of the client for callers already on an event
+            # loop; many requests can then be in flight at once, bounded
+            # by the module-level semaphore and token bucket.
+            self.aclient = openai.AsyncOpenAI(api_key=self.api_key, http_client=_SHARED_AHTTP)
             logger.info("OpenAI client initialized.")
+            # Exact-match summary cache keyed by (model, bounds, text):
+            # repeat descriptions across crawler re-runs cost a sqlite
+            # lookup instead of tokens and a round trip.
+            self._summary_cache = ProcessorCache(db_path="data/openai_cache.db")
+            # Identical (text, types) classification requests repeat within
+            # a run; memoize them in-process.
+            self._detect_cached = lru_cache(maxsize=4096)(self._detect_event_type_uncached)
         except Exception as e:
-            logger.error(f"Failed to initialize OpenAI client: {e}", exc_info=True)
+            logger.error("Failed to initialize OpenAI client: %s", e, exc_info=True)
             raise ValueError("Failed to initialize OpenAI client")
+        # Opt-in gate for routing summaries through the offline Batch API
+        self.use_batch_api = os.getenv("OPENAI_USE_BATCH_API", "").lower() in ("1", "true", "yes")
+        # Prompt skeleton built once: only the bounds and the numbered
+        # descriptions vary per call, so the hot path does a single %
+        # splice instead of re-concatenating the whole template.
+        self._summary_tmpl = (
+            "Rewrite each of the numbered event descriptions below in English. "
+            "Create a compelling and informative summary suitable for a tourist audience.\n"
+            "Include all essential details like what the event is, where, and any specific highlights mentioned.\n"
+            "Each summary should be between %d and %d characters long. "
+            "Do not include the date unless it's part of the core description.\n"
+            "\n"
+            "Descriptions:\n%s"
+        )
+        self._summary_system = (
+            "You are a helpful assistant that summarizes event descriptions for tourists "
+            "in clear and engaging English. Respond with a JSON object of the form "
+            '{"summaries": [...]} containing exactly one summary string per input, in the same order.'
+        )
+
+    def close(self):
+        """Releases instance-owned resources (the summary cache). The
+        pooled HTTP transports are process-wide and shared by every
+        OpenAIClient, so they are deliberately left open here; shut them
+        at process teardown with _SHARED_HTTP.close() and, from a running
+        loop, `await _SHARED_AHTTP.aclose()`."""
+        self._summary_cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def translate_text(self, text: str, target_language: str = "English") -> str | None:
         """
         Translates the given text to the target language using OpenAI.
         (Placeholder implementation)
         """
-        logger.info(f"Attempting to translate text to {target_language} (length: {len(text)})")
+        logger.info("Attempting to translate text to %s (length: %s)", target_language, len(text))
         if not text:
             return ""
         # TODO: Implement actual OpenAI API call for translation
@@ -49,7 +167,7 @@ class OpenAIClient:
         #     logger.info("Translation successful.")
         #     return translation
         # except Exception as e:
-        #     logger.error(f"OpenAI translation failed: {e}", exc_info=True)
+        #     logger.error("OpenAI translation failed: %s", e, exc_info=True)
         #     return None
         logger.warning("translate_text: OpenAI call not implemented yet. Returning original text.")
         return f"[Translated to {target_language}]: {text}" # Placeholder
@@ -59,7 +177,7 @@ class OpenAIClient:
         Summarizes the given text using OpenAI.
         (Placeholder implementation)
         """
-        logger.info(f"Attempting to summarize text (length: {len(text)}) to max {max_length} chars")
+        logger.info("Attempting to summarize text (length: %s) to max %s chars", len(text), max_length)
         if not text:
             return ""
         # TODO: Implement actual OpenAI API call for summarization
@@ -77,17 +195,27 @@ class OpenAIClient:
         #     logger.info("Summarization successful.")
         #     return summary
         # except Exception as e:
-        #     logger.error(f"OpenAI summarization failed: {e}", exc_info=True)
+        #     logger.error("OpenAI summarization failed: %s", e, exc_info=True)
         #     return None
         logger.warning("summarize_text: OpenAI call not implemented yet. Returning truncated text.")
         return f"[Summary]: {text[:max_length]}..." if len(text) > max_length else text # Placeholder
 
     def detect_event_type(self, text: str, possible_types: list[str] | None = None) -> str | None:
+        """
+        Detects the event type from the text using OpenAI.
+        Memoized on (text, sorted types); see _detect_event_type_uncached.
+        """
+        if not text:
+            return None
+        type_key = tuple(sorted(possible_types)) if possible_types else None
+        return self._detect_cached(text, type_key)
+
+    def _detect_event_type_uncached(self, text: str, possible_types: tuple[str, ...] | None = None) -> str | None:
         """
         Detects the event type from the text using OpenAI.
         (Placeholder implementation)
         """
-        logger.info(f"Attempting to detect event type from text (length: {len(text)})")
+        logger.info("Attempting to detect event type from text (length: %s)", len(text))
         if not text:
             return None
         # TODO: Implement actual OpenAI API call for event type detection
@@ -104,56 +232,312 @@ class OpenAIClient:
         #     )
         #     event_type = response.choices[0].message.content.strip()
         #     # Optional: Validate if the returned type is in the possible_types list
-        #     logger.info(f"Event type detection successful: {event_type}")
+        #     logger.info("Event type detection successful: %s", event_type)
         #     return event_type
         # except Exception as e:
-        #     logger.error(f"OpenAI event type detection failed: {e}", exc_info=True)
+        #     logger.error("OpenAI event type detection failed: %s", e, exc_info=True)
         #     return None
         logger.warning("detect_event_type: OpenAI call not implemented yet. Returning 'Unknown'.")
         return "Unknown" # Placeholder
 
+    def submit_summary_batch(self, events, min_chars: int = 300, max_chars: int = 500) -> str | None:
+        """
+        Submits one summary request per event through the Batch API
+        (JSONL upload -> batch job). Batch traffic costs half the tokens
+        and draws on a separate rate-limit pool, at the price of up to
+        24h latency — a good trade for nightly scrapes where nothing
+        waits on the response. Returns the batch id, or None on failure.
+        """
+        return self._submit_batch(
+            [(event.id, event.description) for event in events], min_chars, max_chars
+        )
+
+    def _submit_batch(self, pairs: list[tuple[str, str]], min_chars: int, max_chars: int) -> str | None:
+        """Uploads one summary request per (custom_id, text) pair and
+        starts the batch job; shared by the event and plain-text paths."""
+        lines = []
+        for custom_id, text in pairs:
+            body = {
+                "model": _SUMMARY_MODEL,
+                "messages": [
+                    {"role": "system", "content": "You are a helpful assistant that summarizes event descriptions for tourists in clear and engaging English."},
+                    {"role": "user", "content": (
+                        f"Rewrite the following event description in English, between "
+                        f"{min_chars} and {max_chars} characters, for a tourist audience:\n\n{text}"
+                    )}
+                ],
+                "temperature": 0.6,
+                "seed": _SUMMARY_SEED,
+            }
+            lines.append(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }))
+        payload = ("\n".join(lines) + "\n").encode('utf-8')
+        try:
+            batch_file = self.client.files.create(
+                file=("summaries.jsonl", io.BytesIO(payload)), purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+        except Exception as e:
+            logger.error("Failed to submit summary batch of %s requests: %s", len(pairs), e, exc_info=True)
+            return None
+        logger.info("Submitted summary batch %s with %s requests.", batch.id, len(pairs))
+        return batch.id
+
+    def poll_and_collect(self, batch_id: str, poll_interval: float = 30.0,
+                         timeout: float = 86400.0) -> dict[str, str]:
+        """
+        Polls a batch until it finishes and returns {event_id: summary}.
+        Terminal failure states (or the timeout) yield an empty mapping.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                logger.error("Summary batch %s finished with status %s.", batch_id, batch.status)
+                return {}
+            if time.monotonic() >= deadline:
+                logger.error("Timed out waiting for summary batch %s (status %s).", batch_id, batch.status)
+                return {}
+            time.sleep(poll_interval)
+
+        summaries: dict[str, str] = {}
+        content = self.client.files.content(batch.output_file_id)
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            response_body = (row.get("response") or {}).get("body") or {}
+            choices = response_body.get("choices") or []
+            if choices:
+                summaries[row.get("custom_id")] = choices[0]["message"]["content"].strip()
+        logger.info("Collected %s summaries from batch %s.", len(summaries), batch_id)
+        return summaries
+
+    def enrich_event(self, text: str, possible_types: list[str] | None = None,
+                     target_language: str = "English", min_chars: int = 300,
+                     max_chars: int = 500) -> dict | None:
+        """
+        Fused enrichment: one JSON-mode completion returning translation,
+        summary, event_type and english_summary together. The document is
+        sent (and billed) once instead of once per task, and the caller
+        pays one round trip instead of four.
+        """
+        if not text:
+            return None
+        type_list = ", ".join(possible_types) if possible_types else \
+            "common event categories (e.g., Concert, Festival, Exhibition, Conference, Sport)"
+        system_msg = (
+            f"You are a helpful assistant enriching event descriptions for tourists. "
+            f"For the given text, respond with a JSON object with exactly these keys: "
+            f'"translation" (the text translated to {target_language}), '
+            f'"summary" (a concise summary in the original language), '
+            f'"event_type" (one of: {type_list}), '
+            f'"english_summary" (a compelling {target_language} summary for a tourist audience, '
+            f"between {min_chars} and {max_chars} characters, including what the event is, "
+            f"where, and any highlights, without the date unless it is part of the core description)."
+        )
+        try:
+            response = self._create_completion(
+                model=_SUMMARY_MODEL,
+                messages=[
+                    {"role": "system", "content": system_msg},
+                    {"role": "user", "content": text}
+                ],
+                temperature=0.6, # Allow for some creativity but stay factual
+                seed=_SUMMARY_SEED,
+                response_format={"type": "json_object"},
+            )
+            data = json.loads(response.choices[0].message.content)
+        except Exception as e:
+            logger.error("OpenAI fused enrichment failed: %s", e, exc_info=True)
+            return None
+        result = {key: data.get(key) for key in ("translation", "summary", "event_type", "english_summary")}
+        logger.info("Fused enrichment successful (english summary length: %s).",
+                    len(result["english_summary"] or ""))
+        return result
+
     def generate_english_summary(self, text: str, min_chars: int = 300, max_chars: int = 500) -> str | None:
         """
         Generates a descriptive summary of the given text in English using OpenAI,
         aiming for a length between min_chars and max_chars.
+        Thin wrapper over the batched variant.
         """
-        logger.info(f"Attempting to generate English summary (target: {min_chars}-{max_chars} chars) for text (length: {len(text)})")
         if not text:
             return ""
+        return self.generate_english_summaries([text], min_chars=min_chars, max_chars=max_chars)[0]
+
+    def generate_english_summaries(self, texts: list[str], min_chars: int = 300,
+                                   max_chars: int = 500, batch_size: int = 20) -> list[str | None]:
+        """
+        Generates English summaries for a list of texts, packing up to
+        batch_size descriptions into one chat call: one HTTPS round trip
+        and one system prompt per chunk instead of per event. Returns one
+        summary (or None) per input, in order.
+        """
+        if not texts:
+            return []
+        results, misses, miss_indexes = self._summaries_from_cache(texts, min_chars, max_chars)
+        if misses:
+            if self.use_batch_api:
+                # Half-price offline path: submit the misses as one batch
+                # job and block until it completes. Only sensible for
+                # callers with nothing waiting on the response.
+                logger.info("Generating %s English summaries (%s cached) via the Batch API.",
+                            len(misses), len(texts) - len(misses))
+                fresh = self._summaries_via_batch(misses, min_chars, max_chars)
+            else:
+                logger.info("Generating %s English summaries (%s cached) in batches of %s.",
+                            len(misses), len(texts) - len(misses), batch_size)
+                fresh = []
+                for start in range(0, len(misses), batch_size):
+                    fresh.extend(self._summaries_chunk(misses[start:start + batch_size], min_chars, max_chars))
+            self._store_summaries(results, miss_indexes, misses, fresh, min_chars, max_chars)
+        return results
+
+    def _summaries_via_batch(self, texts: list[str], min_chars: int, max_chars: int) -> list[str | None]:
+        """Routes texts through submit/poll on the Batch API, keyed by
+        position so the results line back up with the inputs."""
+        batch_id = self._submit_batch(
+            [(str(index), text) for index, text in enumerate(texts)], min_chars, max_chars
+        )
+        if batch_id is None:
+            return [None] * len(texts)
+        collected = self.poll_and_collect(batch_id)
+        return [collected.get(str(index)) for index in range(len(texts))]
+
+    @staticmethod
+    def _summary_key(text: str, min_chars: int, max_chars: int) -> str:
+        """Exact-match cache key: same model, bounds and text."""
+        return content_hash(f"{_SUMMARY_MODEL}|{min_chars}|{max_chars}|{text}")
+
+    def _summaries_from_cache(self, texts: list[str], min_chars: int, max_chars: int):
+        """Splits texts into cached results and misses still to generate."""
+        results: list[str | None] = [None] * len(texts)
+        misses: list[str] = []
+        miss_indexes: list[int] = []
+        for index, text in enumerate(texts):
+            cached = self._summary_cache.get(self._summary_key(text, min_chars, max_chars))
+            if cached is not None:
+                results[index] = cached[0]
+            else:
+                misses.append(text)
+                miss_indexes.append(index)
+        return results, misses, miss_indexes
 
-        prompt = f"""Rewrite the following event description in English. Create a compelling and informative summary suitable for a tourist audience.
-Include all essential details like what the event is, where, and any specific highlights mentioned.
-The summary should be between {min_chars} and {max_chars} characters long. Do not include the date unless it's part of the core description.
+    def _store_summaries(self, results, miss_indexes, misses, fresh, min_chars, max_chars):
+        """Slots fresh summaries into the result list and persists them."""
+        for index, text, summary in zip(miss_indexes, misses, fresh):
+            results[index] = summary
+            if summary: # Failures stay uncached so they are retried
+                self._summary_cache.put(self._summary_key(text, min_chars, max_chars), summary, None)
 
-Original Text:
-\"\"\"
-{text}
-\"\"\"
+    def _summaries_request(self, chunk: list[str], min_chars: int, max_chars: int) -> dict:
+        """Builds the completion kwargs for one summary chunk (shared by
+        the sync and async paths)."""
+        numbered = "\n\n".join(f"{i}. {text}" for i, text in enumerate(chunk, 1))
+        prompt = self._summary_tmpl % (min_chars, max_chars, numbered)
 
-English Summary ({min_chars}-{max_chars} characters):"""
+        return dict(
+            model=_SUMMARY_MODEL,
+            messages=[
+                {"role": "system", "content": self._summary_system},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.6, # Allow for some creativity but stay factual
+            seed=_SUMMARY_SEED,
+            max_tokens=150 * len(chunk), # Estimate tokens needed for ~500 chars each
+            response_format={"type": "json_object"},
+        )
 
+    @retry(**_RETRY_KWARGS)
+    def _create_completion(self, **kwargs):
+        """chat.completions.create with exponential-backoff retries on
+        transient errors; anything else (or retry exhaustion) propagates
+        to the caller's error handling."""
+        return self.client.chat.completions.create(**kwargs)
+
+    @retry(**_RETRY_KWARGS)
+    async def _acreate_completion(self, **kwargs):
+        """Async twin of _create_completion."""
+        return await self.aclient.chat.completions.create(**kwargs)
+
+    def _summaries_chunk(self, chunk: list[str], min_chars: int, max_chars: int) -> list[str | None]:
+        """Summarizes one chunk with a single JSON-mode completion."""
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo", # Or consider gpt-4-turbo-preview for potentially better results
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that summarizes event descriptions for tourists in clear and engaging English."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.6, # Allow for some creativity but stay factual
-                max_tokens=150, # Estimate tokens needed for ~500 chars + prompt
-                n=1,
-                stop=None,
+            response = self._create_completion(**self._summaries_request(chunk, min_chars, max_chars))
+        except Exception as e:
+            logger.error("OpenAI English summary generation failed for chunk of %s: %s", len(chunk), e, exc_info=True)
+            return [None] * len(chunk)
+        return self._parse_summaries(response.choices[0].message.content, chunk, min_chars, max_chars)
+
+    async def agenerate_english_summary(self, text: str, min_chars: int = 300, max_chars: int = 500) -> str | None:
+        """Async twin of generate_english_summary."""
+        if not text:
+            return ""
+        results = await self.agenerate_english_summaries([text], min_chars=min_chars, max_chars=max_chars)
+        return results[0]
+
+    async def agenerate_english_summaries(self, texts: list[str], min_chars: int = 300,
+                                          max_chars: int = 500, batch_size: int = 20) -> list[str | None]:
+        """
+        Async twin of generate_english_summaries: the per-chunk requests
+        are issued concurrently with asyncio.gather, so wall time is
+        roughly one round trip regardless of how many chunks there are,
+        bounded by the shared semaphore and token bucket.
+        """
+        if not texts:
+            return []
+        results, misses, miss_indexes = self._summaries_from_cache(texts, min_chars, max_chars)
+        if misses:
+            chunks = [misses[start:start + batch_size] for start in range(0, len(misses), batch_size)]
+            logger.info("Generating %s English summaries (%s cached) across %s concurrent chunks.",
+                        len(misses), len(texts) - len(misses), len(chunks))
+            chunk_results = await asyncio.gather(
+                *(self._asummaries_chunk(chunk, min_chars, max_chars) for chunk in chunks)
             )
-            summary = response.choices[0].message.content.strip()
-            # Basic length check (can be refined)
-            if len(summary) < min_chars / 2 or len(summary) > max_chars * 1.2: # Allow some flexibility
-                 logger.warning(f"Generated summary length ({len(summary)}) is outside the target range ({min_chars}-{max_chars}). Using it anyway.")
+            fresh = [summary for chunk in chunk_results for summary in chunk]
+            self._store_summaries(results, miss_indexes, misses, fresh, min_chars, max_chars)
+        return results
 
-            logger.info(f"English summary generation successful (length: {len(summary)}).")
-            return summary
-        except Exception as e:
-            logger.error(f"OpenAI English summary generation failed: {e}", exc_info=True)
-            return None
+    async def _asummaries_chunk(self, chunk: list[str], min_chars: int, max_chars: int) -> list[str | None]:
+        """Async chunk summarization under the shared rate limits."""
+        await _bucket.acquire()
+        async with _semaphore:
+            try:
+                response = await self._acreate_completion(
+                    **self._summaries_request(chunk, min_chars, max_chars)
+                )
+            except Exception as e:
+                logger.error("OpenAI English summary generation failed for chunk of %s: %s", len(chunk), e, exc_info=True)
+                return [None] * len(chunk)
+        return self._parse_summaries(response.choices[0].message.content, chunk, min_chars, max_chars)
+
+    def _parse_summaries(self, content: str, chunk: list[str], min_chars: int, max_chars: int) -> list[str | None]:
+        """Aligns a {"summaries": [...]} response with the input chunk."""
+        try:
+            raw = json.loads(content).get("summaries") or []
+        except ValueError as e:
+            logger.error("Could not decode summaries response: %s", e)
+            return [None] * len(chunk)
+
+        results: list[str | None] = []
+        for i, text in enumerate(chunk):
+            summary = raw[i].strip() if i < len(raw) and isinstance(raw[i], str) else None
+            if summary and (len(summary) < min_chars / 2 or len(summary) > max_chars * 1.2): # Allow some flexibility
+                logger.warning("Generated summary length (%s) is outside the target range (%s-%s). Using it anyway.", len(summary), min_chars, max_chars)
+            results.append(summary or None)
+        logger.info("English summary chunk complete: %s/%s summaries returned.", sum(1 for r in results if r), len(chunk))
+        return results
 # Example usage (optional)
 if __name__ == '__main__':
     try:
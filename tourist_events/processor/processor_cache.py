@@ -0,0 +1,61 @@
+import os
+import sqlite3
+import threading
+from hashlib import blake2b
+from typing import Optional, Tuple
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def content_hash(text: str) -> str:
+    """Short content key for cache lookups (blake2b is C-implemented and
+    faster than sha256; this is keying, not crypto)."""
+    return blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ProcessorCache:
+    """
+    Persistent cache for OpenAI enrichment results, keyed by a hash of the
+    raw description. Re-crawls mostly see the same descriptions again, so
+    hitting this table replaces two API round trips (summary + type) per
+    repeated event with one indexed sqlite lookup.
+    """
+
+    def __init__(self, db_path: str = "data/processor_cache.db"):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # The processor pool calls this from several threads; sqlite
+        # connections aren't shareable, so serialize with a lock rather
+        # than opening one connection per call.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS enrichment ("
+            "hash TEXT PRIMARY KEY, summary TEXT, type TEXT)"
+        )
+        self._conn.commit()
+        logger.info("ProcessorCache initialized at %s", db_path)
+
+    def get(self, key: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """Returns (summary, event_type) for the key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, type FROM enrichment WHERE hash = ?", (key,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, key: str, summary: Optional[str], event_type: Optional[str]):
+        """Stores the enrichment results for the key."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO enrichment (hash, summary, type) VALUES (?, ?, ?)",
+                (key, summary, event_type),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
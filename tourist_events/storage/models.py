@@ -1,20 +1,53 @@
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
-import uuid
+import json
+import secrets
 
-@dataclass
+try:
+    import orjson as _orjson # C-level serializer, much faster than stdlib json
+except ImportError:
+    _orjson = None
+
+
+@lru_cache(maxsize=65536)
+def _parse_iso(value: str) -> datetime:
+    """
+    Parses an ISO-8601 string, memoized: a crawl produces a small set of
+    distinct date strings shared by many rows, so bulk loads reuse the same
+    datetime instances instead of re-parsing per row.
+    """
+    return datetime.fromisoformat(value)
+
+
+@dataclass(slots=True)
 class Event:
-    """Represents a tourist event."""
+    """Represents a tourist event. slots=True drops the per-instance
+    __dict__, so the thousands of events held during a crawl use a
+    compact fixed layout with C-level attribute access."""
     title: str
     description: str
     date: Optional[datetime] = None
     image_url: Optional[str] = None
+    image_file_id: Optional[str] = None # Telegram file_id once uploaded
     source_url: str = ""
+    source_domain: Optional[str] = None # Normalized netloc, no www. prefix
     event_type: Optional[str] = None
     summary_en: Optional[str] = None # Added field for English summary
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    # token_hex gives a unique 32-char hex id straight from urandom; ids
+    # only need uniqueness, not RFC 4122 semantics, so the UUID object
+    # construction and dashed reformatting are skipped.
+    id: str = field(default_factory=lambda: secrets.token_hex(16))
     created_at: datetime = field(default_factory=datetime.utcnow)
+    # Rendered Telegram caption, filled in lazily by the formatter; purely
+    # derived state, so excluded from init, equality and serialization.
+    _cached_caption: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    # ISO form of the date, computed once so to_dict is pure attribute reads
+    _iso_date: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._iso_date = self.date.isoformat() if self.date else None
 
     def to_dict(self):
         """Converts the Event object to a dictionary."""
@@ -22,25 +55,46 @@ class Event:
             "id": self.id,
             "title": self.title,
             "description": self.description,
-            "date": self.date.isoformat() if self.date else None,
+            "date": self._iso_date,
             "image_url": self.image_url,
+            "image_file_id": self.image_file_id,
             "source_url": self.source_url,
+            "source_domain": self.source_domain,
             "event_type": self.event_type,
             "summary_en": self.summary_en, # Added field
             "created_at": self.created_at.isoformat()
         }
 
+    def to_json(self) -> bytes:
+        """Serializes the event to JSON bytes. Goes through to_dict so the
+        on-disk schema stays exactly as before (ISO date strings, private
+        caches excluded); to_dict itself is pure attribute reads."""
+        if _orjson is not None:
+            return _orjson.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), ensure_ascii=False).encode('utf-8')
+
+    @classmethod
+    def from_json(cls, payload) -> "Event":
+        """Creates an Event from JSON bytes (or str)."""
+        if _orjson is not None:
+            return cls.from_dict(_orjson.loads(payload))
+        if isinstance(payload, bytes):
+            payload = payload.decode('utf-8')
+        return cls.from_dict(json.loads(payload))
+
     @classmethod
     def from_dict(cls, data):
         """Creates an Event object from a dictionary."""
         return cls(
-            id=data.get("id", str(uuid.uuid4())),
+            id=data.get("id") or secrets.token_hex(16), # Any stored id string (incl. legacy UUIDs) is kept as-is
             title=data.get("title"),
             description=data.get("description"),
-            date=datetime.fromisoformat(data["date"]) if data.get("date") else None,
+            date=_parse_iso(data["date"]) if data.get("date") else None,
             image_url=data.get("image_url"),
+            image_file_id=data.get("image_file_id"),
             source_url=data.get("source_url"),
+            source_domain=data.get("source_domain"),
             event_type=data.get("event_type"),
             summary_en=data.get("summary_en"), # Added field
-            created_at=datetime.fromisoformat(data.get("created_at", datetime.utcnow().isoformat()))
+            created_at=_parse_iso(data["created_at"]) if data.get("created_at") else datetime.utcnow()
         )
\ No newline at end of file
@@ -1,10 +1,18 @@
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from ..storage.models import Event
 from ..utils.logger import get_logger
-import html
 
 logger = get_logger(__name__)
 
+# html.escape makes three sequential replace passes over the string; a
+# translate table does the same work in one C-level pass.
+_HTML_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+
+def _esc(s: str) -> str:
+    """Escapes HTML-special characters in a single pass."""
+    return s.translate(_HTML_TABLE)
+
 def format_event_caption(event: Event) -> str:
     """
     Formats a single Event object into an HTML caption string for a Telegram photo message.
@@ -16,26 +24,31 @@ def format_event_caption(event: Event) -> str:
     Returns:
         The formatted caption string (HTML). Returns empty string if essential info is missing.
     """
-    logger.debug(f"Formatting caption for event: {event.title} (ID: {event.id})")
+    # Captions are deterministic per event; the first render is stored on
+    # the object so repeat sends skip the escape/format work entirely.
+    if event._cached_caption is not None:
+        return event._cached_caption
+
+    logger.debug("Formatting caption for event: %s (ID: %s)", event.title, event.id)
 
     # --- Prepare content parts ---
     # Date (dd.mm.yyyy, monospace)
     date_str = f"<code>{event.date.strftime('%d.%m.%Y')}</code>" if event.date else ""
 
     # Title (bold)
-    title_str = f"<b>{html.escape(event.title)}</b>" if event.title else ""
+    title_str = f"<b>{_esc(event.title)}</b>" if event.title else ""
     if not title_str:
-        logger.warning(f"Event {event.id} missing title. Cannot format caption.")
+        logger.warning("Event %s missing title. Cannot format caption.", event.id)
         return "" # Title is essential
 
     # Description (blockquote, prefer English summary)
     desc_content = event.summary_en if event.summary_en else event.description
     if not desc_content:
         desc_content = "No description available."
-    desc_str = f"<blockquote>{html.escape(desc_content)}</blockquote>"
+    desc_str = f"<blockquote>{_esc(desc_content)}</blockquote>"
 
     # Source Link (monospace)
-    source_str = f"Source: <code>{html.escape(event.source_url)}</code>" if event.source_url else ""
+    source_str = f"Source: <code>{_esc(event.source_url)}</code>" if event.source_url else ""
 
     # --- Combine parts ---
     caption_parts = [part for part in [date_str, title_str, desc_str, source_str] if part] # Filter empty parts
@@ -44,14 +57,14 @@ def format_event_caption(event: Event) -> str:
     # --- Truncate if necessary ---
     # Telegram caption limit is 1024 characters
     if len(caption_text) > 1024:
-        logger.warning(f"Generated caption for event {event.id} exceeds 1024 chars ({len(caption_text)}). Truncating description.")
+        logger.warning("Generated caption for event %s exceeds 1024 chars (%s). Truncating description.", event.id, len(caption_text))
         # Calculate overhead (tags, newlines, etc.)
         overhead = len(caption_text) - len(desc_content) # Approx length without description content
         max_desc_len = 1024 - overhead - 3 # -3 for "..."
         if max_desc_len < 0: max_desc_len = 0 # Ensure non-negative
 
         truncated_desc_content = desc_content[:max_desc_len] + "..."
-        desc_str = f"<blockquote>{html.escape(truncated_desc_content)}</blockquote>"
+        desc_str = f"<blockquote>{_esc(truncated_desc_content)}</blockquote>"
 
         # Rebuild caption with truncated description
         caption_parts = [part for part in [date_str, title_str, desc_str, source_str] if part]
@@ -62,6 +75,7 @@ def format_event_caption(event: Event) -> str:
              caption_text = caption_text[:1021] + "..."
 
 
+    event._cached_caption = caption_text
     return caption_text
 
 # Example usage (optional)
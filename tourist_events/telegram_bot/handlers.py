@@ -1,8 +1,9 @@
+import asyncio
+from itertools import islice
+
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from datetime import datetime
-from urllib.parse import urlparse
-from collections import defaultdict
 from typing import List, Dict, Optional # Added for type hinting
 
 from ..utils.logger import get_logger
@@ -11,12 +12,64 @@ from .formatters import format_event_caption # Updated import
 
 logger = get_logger(__name__)
 
+# EventStorage lives at module scope, not in bot_data: PicklePersistence
+# deepcopies/pickles bot_data on every flush, and the storage holds an
+# unpicklable threading.Lock (and shouldn't be snapshotted anyway — it
+# re-reads the JSONL on demand).
+_event_storage: Optional[EventStorage] = None
+
+
+def set_event_storage(storage: EventStorage) -> None:
+    """Registers the storage instance the command handlers read from."""
+    global _event_storage
+    _event_storage = storage
+
+
+# Hard cap on events sent per /events call, applied lazily with islice so
+# the tail of the merged stream is never materialized
+_MAX_EVENTS_TOTAL = 20
+
 # --- Command Handlers ---
 
+async def _send_one(bot, chat_id: int, event, caption: str, sem: asyncio.Semaphore,
+                    file_id_cache: Optional[Dict[str, str]] = None) -> bool:
+    """Sends a single event (photo or text); returns True on success."""
+    async with sem:
+        try:
+            if event.image_file_id or event.image_url:
+                # Prefer the Telegram file_id: Telegram reuses its cached
+                # media instead of re-fetching image_url from the source
+                # site on every send.
+                file_id = event.image_file_id
+                if file_id is None and file_id_cache is not None:
+                    file_id = file_id_cache.get(event.id)
+                msg = await bot.send_photo(
+                    chat_id=chat_id,
+                    photo=file_id or event.image_url,
+                    caption=caption,
+                    parse_mode='HTML'
+                )
+                if file_id is None and file_id_cache is not None and msg.photo:
+                    file_id_cache[event.id] = msg.photo[-1].file_id
+            else:
+                # Send as text if no image, using the formatted caption
+                await bot.send_message(
+                    chat_id=chat_id,
+                    text=caption,
+                    parse_mode='HTML',
+                    disable_web_page_preview=True
+                )
+            return True
+        except Exception as send_error:
+            logger.error("Failed to send event %s (%s) to chat %s: %s", event.id, event.title, chat_id, send_error)
+            return False
+
+
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Sends a welcome message when the /start command is issued."""
     user = update.effective_user
-    logger.info(f"User {user.username} (ID: {user.id}) started the bot.")
+    logger.info("User %s (ID: %s) started the bot.", user.username, user.id)
     await update.message.reply_html(
         rf"Hi {user.mention_html()}! 👋", # Changed to English
         reply_markup=None, # Optional: Add a keyboard later
@@ -27,7 +80,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Sends a message explaining how to use the bot when the /help command is issued."""
-    logger.info(f"User {update.effective_user.username} requested help.")
+    logger.info("User %s requested help.", update.effective_user.username)
     help_text = (
         "Here's what I can do:\n"
         "📅 /events - Show upcoming events.\n"
@@ -40,96 +93,63 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 async def events_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Fetches and displays upcoming events when the /events command is issued."""
     user = update.effective_user
-    logger.info(f"User {user.username} requested events.")
+    logger.info("User %s requested events.", user.username)
     chat_id = update.effective_chat.id
 
-    # Access EventStorage from bot_data
-    storage: EventStorage = context.application.bot_data.get("event_storage")
+    storage = _event_storage
     if not storage:
-        logger.error("EventStorage not found in bot_data.")
+        logger.error("EventStorage has not been registered.")
         await context.bot.send_message(chat_id, "Error: Could not access event storage.") # Changed to English
         return
 
     try:
         # Fetch upcoming events (e.g., from today onwards)
         # TODO: Add more sophisticated filtering options later
-        filters = {'min_date': datetime.now().date()}
-        events = storage.get_events(filters=filters)
-
-        if not events:
+        # Grouping and per-source top-2 happen inside storage; the threaded
+        # call keeps the event loop free for other chats.
+        min_date = datetime.now().date()
+        final_events = await asyncio.to_thread(
+            lambda: list(islice(storage.get_top_events_per_source(min_date, 2), _MAX_EVENTS_TOTAL))
+        )
+
+        if not final_events:
             await context.bot.send_message(chat_id, "No upcoming events found right now. Try again later!") # Changed to English
             # Optionally trigger a crawl here if desired
             return
 
-        logger.info(f"Found {len(events)} upcoming events for user {user.username}.")
-
-        # --- Group, sort, and limit events per source ---
-        events_by_source: Dict[str, List] = defaultdict(list)
-        for event in events:
-            if event.source_url:
-                try:
-                    domain = urlparse(event.source_url).netloc
-                    # Normalize domain (e.g., remove www.)
-                    domain = domain.replace("www.", "")
-                    events_by_source[domain].append(event)
-                except Exception:
-                    logger.warning(f"Could not parse domain from URL: {event.source_url}")
-                    events_by_source["unknown"].append(event) # Group events with bad URLs
-            else:
-                 events_by_source["unknown"].append(event) # Group events without URLs
-
-
-        final_events = []
-        for source, source_events in events_by_source.items():
-            # Sort events within the source group by date (most recent first)
-            source_events.sort(key=lambda x: x.date if x.date else datetime.min, reverse=True)
-            # Take the top 2 most recent events
-            final_events.extend(source_events[:2])
-            logger.debug(f"Selected top {len(source_events[:2])} events from source: {source}")
-
-        # Sort the final combined list by date (most recent first)
-        final_events.sort(key=lambda x: x.date if x.date else datetime.min, reverse=True)
-
-        logger.info(f"Prepared {len(final_events)} events to send after per-source filtering.")
+        logger.info("Prepared %s events to send after per-source filtering.", len(final_events))
 
         # --- Send events as photos with captions ---
-        # No overall limit needed now, as we limited per source
-        # max_events_to_show = 10 # Limit the number of events shown initially - REMOVED
-
-        sent_count = 0
+        # Dispatch all sends concurrently instead of paying one round trip
+        # per event; the semaphore bounds in-flight requests and the
+        # Application's AIORateLimiter keeps us inside Telegram's limits.
+        sem = asyncio.Semaphore(8)
+        # Captions are deterministic per event id; reuse them across users
+        # instead of re-formatting the same events for every /events call.
+        caption_cache: Dict[str, str] = context.application.bot_data.setdefault("caption_cache", {})
+        # file_ids from the first upload; persisted with bot state
+        file_id_cache: Dict[str, str] = context.application.bot_data.setdefault("file_id_cache", {})
+        if len(caption_cache) > 4096: # Crude bound; events churn slowly
+            caption_cache.clear()
+        tasks = []
         for event in final_events:
-            # The limit per source is already applied, no need for max_events_to_show check here
-            # if sent_count >= max_events_to_show:
-            #     break
-
-            caption = format_event_caption(event) # Use the updated formatter
+            caption = caption_cache.get(event.id)
+            if caption is None:
+                caption = format_event_caption(event) # Use the updated formatter
+                if caption:
+                    caption_cache[event.id] = caption
 
             # Only proceed if a caption was successfully generated (i.e., summary_en exists)
             if caption:
-                try:
-                    if event.image_url:
-                        await context.bot.send_photo(
-                            chat_id=chat_id,
-                            photo=event.image_url,
-                            caption=caption,
-                            parse_mode='HTML'
-                        )
-                    else:
-                        # Send as text if no image, using the formatted caption
-                        await context.bot.send_message(
-                            chat_id=chat_id,
-                            text=caption,
-                            parse_mode='HTML',
-                            disable_web_page_preview=True
-                        )
-                    sent_count += 1
-                except Exception as send_error:
-                    logger.error(f"Failed to send event {event.id} ({event.title}) to user {user.username}: {send_error}")
-                    # Optionally inform the user about the specific failure
-                    # await context.bot.send_message(chat_id, f"Could not send event: {event.title}")
+                tasks.append(asyncio.create_task(
+                    _send_one(context.bot, chat_id, event, caption, sem, file_id_cache)
+                ))
             else:
-                logger.info(f"Skipping event {event.id} ({event.title}) for user {user.username} due to missing English summary.")
-                # await asyncio.sleep(0.5) # Optional delay
+                logger.info("Skipping event %s (%s) for user %s due to missing English summary.", event.id, event.title, user.username)
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        sent_count = sum(1 for result in results if result is True)
+        logger.info("Sent %d/%d events to user %s.", sent_count, len(tasks), user.username)
 
 
         # Remove or adjust the "more events" message as it might be confusing now
@@ -137,7 +157,7 @@ async def events_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         #      await context.bot.send_message(chat_id, f"Displayed the 2 most recent events per source.")
 
     except Exception as e:
-        logger.error(f"Error fetching or sending events for user {user.username}: {e}", exc_info=True)
+        logger.error("Error fetching or sending events for user %s: %s", user.username, e, exc_info=True)
         await context.bot.send_message(chat_id, "An error occurred while fetching events.") # Changed to English
 
 
@@ -146,6 +166,6 @@ async def events_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 #     query = update.callback_query
 #     await query.answer() # Acknowledge the button press
 #     data = query.data # Data associated with the button
-#     logger.info(f"Button pressed with data: {data}")
+#     logger.info("Button pressed with data: %s", data)
 #     # Handle different button actions based on 'data'
 #     await query.edit_message_text(text=f"Selected option: {data}")
\ No newline at end of file
@@ -1,6 +1,9 @@
+import atexit
 import logging
+import logging.config
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 LOG_DIR = "logs"
 LOG_FILE = os.path.join(LOG_DIR, "tourist_events.log")
@@ -8,34 +11,67 @@ LOG_FILE = os.path.join(LOG_DIR, "tourist_events.log")
 # Create log directory if it doesn't exist
 os.makedirs(LOG_DIR, exist_ok=True)
 
-# Configure logging
-log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_configured = False
+_listener = None
 
-# File handler
-file_handler = RotatingFileHandler(LOG_FILE, maxBytes=10*1024*1024, backupCount=5) # 10MB per file, 5 backups
-file_handler.setFormatter(log_formatter)
-file_handler.setLevel(logging.INFO)
 
-# Console handler
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(log_formatter)
-console_handler.setLevel(logging.INFO)
+def _configure():
+    """One-time logging setup: handlers live on the root logger and every
+    module logger reaches them through standard propagation, so get_logger
+    needs no per-call handler bookkeeping (and handlers can never be
+    attached twice). The file/console handlers are then moved behind a
+    QueueListener so producers never block on disk writes or rollover."""
+    global _configured, _listener
+    if _configured:
+        return
+    logging.config.dictConfig({
+        'version': 1,
+        'disable_existing_loggers': False,
+        'formatters': {
+            'standard': {'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'},
+        },
+        'handlers': {
+            'file': {
+                'class': 'logging.handlers.RotatingFileHandler',
+                'filename': LOG_FILE,
+                'maxBytes': 10 * 1024 * 1024,  # 10MB per file, 5 backups
+                'backupCount': 5,
+                'formatter': 'standard',
+                'level': 'INFO',
+            },
+            'console': {
+                'class': 'logging.StreamHandler',
+                'formatter': 'standard',
+                'level': 'INFO',
+            },
+        },
+        'root': {'level': 'INFO', 'handlers': ['file', 'console']},
+    })
 
-def get_logger(name):
-    """Gets a configured logger instance."""
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    # Lift the configured sinks off the root logger and drain them from a
+    # background thread: a log call on the hot path becomes a queue put
+    # instead of a locked write+flush through RotatingFileHandler.
+    root = logging.getLogger()
+    sinks = root.handlers[:]
+    for handler in sinks:
+        root.removeHandler(handler)
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *sinks, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop) # Flush queued records at shutdown
+    root.addHandler(QueueHandler(log_queue))
 
-    # Avoid adding handlers multiple times
-    if not logger.handlers:
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+    _configured = True
 
-    return logger
+
+_configure()
+
+# A configured logger is now just a name lookup
+get_logger = logging.getLogger
 
 # Example usage (optional, can be removed or kept for testing)
 if __name__ == '__main__':
     logger = get_logger(__name__)
     logger.info("Logging setup complete.")
     logger.warning("This is a warning message.")
-    logger.error("This is an error message.")
\ No newline at end of file
+    logger.error("This is an error message.")
@@ -0,0 +1,52 @@
+import os
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+class SeenUrlCache:
+    """
+    Persistent cache of already-scraped URLs.
+    Backed by a plain text file (one URL per line) so spiders can skip
+    detail pages that were already processed in previous crawl runs.
+    New URLs are buffered in memory and written out in one batch on flush().
+    """
+    def __init__(self, cache_path: str = "data/seen_urls.txt"):
+        self.cache_path = cache_path
+        self._seen = set()
+        self._pending = []
+        self._load()
+        logger.info("SeenUrlCache initialized with %s known URLs from %s", len(self._seen), self.cache_path)
+
+    def _load(self):
+        """Loads previously seen URLs from the cache file, if present."""
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self._seen = {line.strip() for line in f if line.strip()}
+        except IOError as e:
+            logger.error("Failed to load URL cache from %s: %s", self.cache_path, e)
+            self._seen = set()
+
+    def contains(self, url: str) -> bool:
+        """Returns True if the URL was already scraped in this or a previous run."""
+        return url in self._seen
+
+    def add(self, url: str):
+        """Marks a URL as scraped. Persisted on the next flush()."""
+        if url not in self._seen:
+            self._seen.add(url)
+            self._pending.append(url)
+
+    def flush(self):
+        """Appends all newly added URLs to the cache file in one batch."""
+        if not self._pending:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            with open(self.cache_path, 'a', encoding='utf-8') as f:
+                f.write("\n".join(self._pending) + "\n")
+            logger.info("Persisted %s new URLs to %s", len(self._pending), self.cache_path)
+            self._pending = []
+        except IOError as e:
+            logger.error("Failed to persist URL cache to %s: %s", self.cache_path, e)